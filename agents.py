@@ -1,47 +1,122 @@
 from pypokerengine.players import BasePokerPlayer
 import random
 import uuid
+from collections import deque
+import hashlib
 import os
 from dotenv import load_dotenv
 import time
 import anthropic
 from openai import OpenAI
 from poker_game import broadcast_chat_message, gui_queue, uuid_to_player_name
+from opponent_stats import OpponentStatsTracker
+from budgets import SeatBudget, LEVEL_NAMES, NO_CHAT, SHRINK_PROMPTS, LOCAL_POLICY, LOCAL_POLICY_MODEL, local_policy_action
+from prompt_assembler import PromptAssembler, RollingSummary, render_hands, render_round_state
 
 load_dotenv()
 
+
+def share_opponent_stats(agents):
+    # Every seat sees the same events, so one tracker per table is enough; the
+    # first seat feeds it and the others only read it
+    tracker = OpponentStatsTracker()
+    for index, agent in enumerate(agents):
+        agent.opponent_stats = tracker
+        agent.updates_opponent_stats = index == 0
+    return tracker
+
+
 class ModelPokerAgent(BasePokerPlayer):
     def __init__(self, model_name, personality_description, display_name):
         super().__init__()
         self.model_name = model_name
         self.personality_description = personality_description
-        self.memory = []
+        # Short, stable id for the personality text, so analyses can tell prompt versions apart
+        self.personality_id = hashlib.sha1(personality_description.encode('utf-8')).hexdigest()[:8]
+        self.memory = deque(maxlen=5)  # Only the last few decisions feed the prompt
         self.display_name = display_name
         self.chat_history = []
         self.action_delay = 7  # Add a delay before taking action
         self.game_memory = []
+        self.prompt_assembler = PromptAssembler(model_name)
+        self.use_model_summary = False  # Summarize older hands with the model instead of rules
+        self.history_summary = RollingSummary(refresh_every=5, recent_hands=5, summarizer=self.summarize_hands_with_model)
+        self.hand_start_index = 0
+        self.hand_model = None  # Model behind this seat's latest decision in the current hand
+        self.hand_start_stack = None
+        self.opponent_stats = OpponentStatsTracker()  # Replaced by the table's shared tracker, see share_opponent_stats
+        self.updates_opponent_stats = True  # Only one seat per table feeds a shared tracker
+        self.budget = SeatBudget()  # Unlimited unless replaced, see setup_players in main.py
+        self.exporter = None  # Optional DatasetExporter shared by the table
+        self.results = None  # Optional results_db.TableRecorder shared by the table
+        self.last_prompt = None
+        self.last_response = None
+        self.last_model = None
 
     def declare_action(self, valid_actions, hole_card, round_state):
+        self.update_budget_level()
         self.update_memory(hole_card, round_state)
         time.sleep(self.action_delay)
 
-        action, amount = self.get_action_from_model(valid_actions, hole_card, round_state)
+        self.last_prompt = None
+        self.last_response = None
+        self.last_model = self.served_model()
+        self.hand_model = self.last_model
+        if self.budget.level >= LOCAL_POLICY:
+            action, amount = local_policy_action(valid_actions, hole_card)
+        else:
+            action, amount = self.get_action_from_model(valid_actions, hole_card, round_state)
 
+        # Only what the hand history needs; full round states are kept by the exporter if enabled
         self.game_memory.append({
             'action': action,
             'amount': amount,
-            'state': round_state,
+            'street': round_state['street'],
+            'round_count': round_state.get('round_count', 0),
             'hole_card': hole_card
         })
 
+        if self.exporter:
+            self.exporter.record_decision(self.uuid, self.build_decision_record(
+                valid_actions, hole_card, round_state, action, amount
+            ))
+
         self.consider_chatting_or_responding(round_state, action, amount)
 
         return action, amount
 
+    def build_decision_record(self, valid_actions, hole_card, round_state, action, amount):
+        pot = round_state.get('pot', {})
+        street_paid = 0
+        for entry in round_state.get('action_histories', {}).get(round_state['street'], []):
+            if entry.get('uuid') == self.uuid and 'amount' in entry:
+                street_paid = entry['amount']
+        return {
+            'agent': self.display_name,
+            'model': self.last_model,
+            'personality': self.personality_id,
+            'policy': 'local' if self.last_model == LOCAL_POLICY_MODEL else 'model',
+            'round_count': round_state.get('round_count', 0),
+            'street': round_state['street'],
+            'small_blind_amount': round_state.get('small_blind_amount', 0),
+            'hole_card': hole_card,
+            'community_card': round_state.get('community_card', []),
+            'pot': pot.get('main', {}).get('amount', 0) + sum(side.get('amount', 0) for side in pot.get('side', [])),
+            'stack': self.get_own_stack(round_state.get('seats', [])),
+            # Everyone still contesting the pot, this seat included; all-in players are still in the hand
+            'active_players': sum(1 for seat in round_state.get('seats', []) if seat.get('state') in ('participating', 'allin')),
+            'valid_actions': valid_actions,
+            'to_call': max(valid_actions[1]['amount'] - street_paid, 0),
+            'prompt': self.last_prompt,
+            'response': self.last_response,
+            'action': action,
+            'amount': amount,
+        }
+
     def update_memory(self, hole_card, round_state):
         self.memory.append({
             'hole_card': hole_card,
-            'round_state': round_state,
+            'street': round_state['street'],
         })
 
     def decide_to_chat(self, round_state):
@@ -77,30 +152,120 @@ Talk to them and respond to their chat. Refer to them by name.
         
         pass
 
+    def parse_action_response(self, response_text, valid_actions):
+        response_text = response_text.lower()
+        for action in valid_actions:
+            action_name = action['action']
+            if action_name in response_text:
+                amount = action.get('amount', 0)
+                if action_name == 'raise':
+                    amount = self.extract_raise_amount(response_text, action)
+                return action_name, amount
+        return valid_actions[0]['action'], valid_actions[0].get('amount', 0)
+
+    def extract_raise_amount(self, response_text, action):
+        import re
+        amounts = re.findall(r'\b\d+\b', response_text)
+        amount_info = action['amount']
+        if amounts:
+            amount = int(amounts[0])
+            if isinstance(amount_info, dict):
+                min_amount = amount_info['min']
+                max_amount = amount_info['max']
+                if min_amount <= amount <= max_amount:
+                    return amount
+                else:
+                    return min_amount
+            else:
+                return amount_info
+        else:
+            if isinstance(amount_info, dict):
+                return amount_info['min']
+            else:
+                return amount_info
+
+    def active_model(self):
+        self.update_budget_level()
+        return self.budget.model_for(self.model_name)
+
+    def served_model(self):
+        # What actually answers this seat's decisions, as recorded in exports and results
+        self.update_budget_level()
+        if self.budget.level >= LOCAL_POLICY:
+            return LOCAL_POLICY_MODEL
+        return self.active_model()
+
+    def prompt_budget(self):
+        if self.budget.level >= SHRINK_PROMPTS:
+            return self.prompt_assembler.budget // 2
+        return None
+
+    def record_usage(self, model, input_tokens, output_tokens, latency):
+        previous_level = self.budget.level
+        self.budget.record_usage(model, input_tokens, output_tokens, latency)
+        self.announce_budget_level(previous_level)
+
+    def update_budget_level(self):
+        # Other seats drain a shared table budget too, so the level is rechecked
+        # before every call rather than only after this seat's own usage
+        previous_level = self.budget.level
+        self.budget.update_level()
+        self.announce_budget_level(previous_level)
+
+    def announce_budget_level(self, previous_level):
+        if self.budget.level != previous_level:
+            print(f"{self.display_name}: budget low ({self.budget.describe()}), switching to {LEVEL_NAMES[self.budget.level]}")
+
+    def create_action_prompt(self, valid_actions, hole_card, round_state):
+        assembler = self.prompt_assembler
+        assembler.add_section('personality', self.personality_description, required=True)
+        assembler.add_section('hand', f"""
+You are playing Texas Hold'em poker.
+Your hand: {hole_card}
+Community cards: {round_state['community_card']}
+Valid actions: {[action['action'] for action in valid_actions]}
+""", required=True)
+        # The header lines (street, pot, cards, stacks) matter more than the action list below them
+        assembler.add_section('round_state', render_round_state(round_state, uuid_to_player_name), priority=4, keep='start')
+        opponent_stats = self.opponent_stats.render(uuid_to_player_name, exclude_uuid=self.uuid)
+        if opponent_stats:
+            assembler.add_section('opponent_stats', f"Opponent tendencies:\n{opponent_stats}", priority=3)
+        assembler.add_section('past_experiences', f"Past experiences: {self.summarize_memory()}", priority=1)
+        assembler.add_section('chat', f"Recent chat:\n{self.get_recent_chat_history()}", priority=2)
+        recent_hands = self.history_summary.recent()
+        if recent_hands:
+            assembler.add_section('recent_hands', f"Recent hands:\n{render_hands(recent_hands)}", priority=3)
+        if self.history_summary.summary:
+            assembler.add_section('history_summary', f"Earlier hands: {self.history_summary.summary}", priority=0)
+        assembler.add_section('instructions', """
+Based on your personality, past experiences, chat history, and the game state, what action will you take?
+Respond with one of the valid actions and an amount if necessary.
+""", required=True)
+        return assembler.build(budget=self.prompt_budget())
+
     def summarize_memory(self):
-        recent_memory = self.memory[-5:]  # last 5 entries
         summary = []
-        for entry in recent_memory:
+        for entry in self.memory:
             hole_cards = entry['hole_card']
-            round_street = entry['round_state']['street']
+            round_street = entry['street']
             summary.append(f"Hand: {hole_cards}, Round: {round_street}")
         return '; '.join(summary)
 
     def get_recent_chat_history(self):
         return "\n".join(self.chat_history[-5:])
 
-    def summarize_game_memory(self):
-        recent_memory = self.game_memory[-5:]
-        summary = []
-        for entry in recent_memory:
-            summary.append(f"Action: {entry['action']}, Result: {'win' if entry.get('win', False) else 'loss'}")
-        return '; '.join(summary)
-
     def receive_game_start_message(self, game_info):
         print(f"{self.display_name}: receive_game_start_message called")
+        self.hand_start_stack = self.get_own_stack(game_info.get('seats', []))
+        if self.results:
+            self.results.on_game_start(game_info)
 
     def receive_round_start_message(self, round_count, hole_card, seats):
         print(f"{self.display_name}: receive_round_start_message called")
+        self.hand_start_index = len(self.game_memory)
+        self.hand_model = None
+        if self.updates_opponent_stats:
+            self.opponent_stats.on_round_start(seats)
         gui_queue.put(('player_hole_cards', {
             'player_uuid': str(self.uuid),
             'hole_card': hole_card
@@ -108,18 +273,75 @@ Talk to them and respond to their chat. Refer to them by name.
 
     def receive_street_start_message(self, street, round_state):
         print(f"{self.display_name}: receive_street_start_message called")
+        if self.updates_opponent_stats:
+            self.opponent_stats.on_street_start(street, round_state)
 
     def receive_game_update_message(self, action, round_state):
         print(f"{self.display_name}: receive_game_update_message called")
+        if self.updates_opponent_stats:
+            self.opponent_stats.on_action(action)
         message = self.consider_chatting_or_responding(round_state, last_action=action)
         if message:
             broadcast_chat_message(self.display_name, message)
 
     def receive_round_result_message(self, winners, hand_info, round_state):
         print(f"{self.display_name}: receive_round_result_message called")
+        if self.updates_opponent_stats:
+            self.opponent_stats.on_round_result(winners, hand_info)
         if self.game_memory:
             last_action = self.game_memory[-1]
             last_action['win'] = any(winner['uuid'] == self.uuid for winner in winners)
+        self.record_hand_for_summary(winners, round_state)
+        stack_change = self.hand_stack_change(round_state)
+        # Round start seats already have the blinds taken out, so the next hand
+        # is measured from this hand's final stack instead
+        self.hand_start_stack = self.get_own_stack(round_state.get('seats', []))
+        if self.exporter:
+            self.exporter.record_outcome(self.uuid, {
+                'win': any(winner['uuid'] == self.uuid for winner in winners),
+                'stack_change': stack_change,
+                'showdown': bool(hand_info),
+                'winners': [uuid_to_player_name.get(str(winner['uuid']), winner.get('name')) for winner in winners],
+            })
+        if self.results:
+            # Credit the hand to whatever actually played it, e.g. a cheaper model or
+            # the local policy, so their results don't count towards the seat's model
+            self.results.on_hand_result(
+                self.uuid, self.display_name, self.hand_model or self.served_model(), round_state, stack_change,
+                any(winner['uuid'] == self.uuid for winner in winners), bool(hand_info)
+            )
+
+    def summarize_hands_with_model(self, previous_summary, hands):
+        if not self.use_model_summary or self.budget.level >= NO_CHAT:
+            return self.history_summary.rule_based_summary()
+        prompt = f"""
+Summary of your earlier poker hands so far: {previous_summary or 'None'}
+Hands since then:
+{render_hands(hands)}
+
+Update the summary in 1-2 sentences, keeping only what matters for future decisions.
+"""
+        return self.get_chat_response(prompt.strip(), None)
+
+    def get_own_stack(self, seats):
+        for seat in seats:
+            if seat.get('uuid') == self.uuid:
+                return seat.get('stack', 0)
+        return None
+
+    def hand_stack_change(self, round_state):
+        end_stack = self.get_own_stack(round_state.get('seats', []))
+        if end_stack is None or self.hand_start_stack is None:
+            return 0
+        return end_stack - self.hand_start_stack
+
+    def record_hand_for_summary(self, winners, round_state):
+        self.history_summary.record_hand({
+            'round_count': round_state.get('round_count', 0),
+            'actions': [entry['action'] for entry in self.game_memory[self.hand_start_index:]],
+            'win': any(winner['uuid'] == self.uuid for winner in winners),
+            'stack_change': self.hand_stack_change(round_state),
+        })
 
     def set_uuid(self, uuid):
         super().set_uuid(uuid)
@@ -133,6 +355,10 @@ Talk to them and respond to their chat. Refer to them by name.
         }))
 
     def consider_chatting_or_responding(self, round_state, action=None, amount=None, last_action=None):
+        self.update_budget_level()
+        if self.budget.level >= NO_CHAT:
+            return None
+
         chat_chance = 0.2  # 20% base chance to chat
 
         if action:
@@ -160,20 +386,21 @@ Talk to them and respond to their chat. Refer to them by name.
         else:
             last_action_str = "None"
         
-        prompt = f"""
-{self.personality_description}
-You are playing Texas Hold'em poker.
-Current round state: {round_state}
+        assembler = self.prompt_assembler
+        assembler.add_section('personality', self.personality_description, required=True)
+        assembler.add_section('intro', "You are playing Texas Hold'em poker.", required=True)
+        assembler.add_section('round_state', f"Current round state:\n{render_round_state(round_state, uuid_to_player_name)}", priority=2, keep='start')
+        assembler.add_section('actions', f"""
 Your last action: {action_str}
 Last action by another player: {last_action_str}
-Recent chat history:
-{self.get_recent_chat_history()}
-
+""", required=True)
+        assembler.add_section('chat', f"Recent chat history:\n{self.get_recent_chat_history()}", priority=3)
+        assembler.add_section('instructions', """
 Based on your personality, the current game state, and recent actions, generate a short chat message (1-2 sentences) to engage with the other players. 
 You can comment on the game, respond to others, or just chat. Be natural and stay in character.
 If you don't think it's appropriate to chat right now, respond with an empty string.
-"""
-        return prompt.strip()
+""", required=True)
+        return assembler.build(budget=self.prompt_budget())
 
 
 # gpt-4o
@@ -184,80 +411,34 @@ class GPT4PokerAgent(ModelPokerAgent):
         self.is_event_handler = True  # Flag to identify this agent as the event handler
 
     def get_chat_response(self, prompt, round_state):
-        completion = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=[
-                {"role": "system", "content": f"{self.personality_description} Respond with a brief message (1-2 sentences max)."},
-                {"role": "user", "content": f"Game state: {round_state}\n\n{prompt}"}
-            ],
-            max_tokens=50
-        )
+        completion = self.create_completion([
+            {"role": "system", "content": f"{self.personality_description} Respond with a brief message (1-2 sentences max)."},
+            {"role": "user", "content": prompt}
+        ])
         return completion.choices[0].message.content.strip()
 
     def get_action_from_model(self, valid_actions, hole_card, round_state):
         prompt = self.create_action_prompt(valid_actions, hole_card, round_state)
-        completion = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=[
-                {"role": "system", "content": self.personality_description},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=50
-        )
+        completion = self.create_completion([
+            {"role": "system", "content": self.personality_description},
+            {"role": "user", "content": prompt}
+        ])
+        self.last_prompt = prompt
+        self.last_response = completion.choices[0].message.content
         action = self.parse_action_response(completion.choices[0].message.content, valid_actions)
         return action
 
-    def create_action_prompt(self, valid_actions, hole_card, round_state):
-        memory_summary = self.summarize_memory()
-        chat_history = self.get_recent_chat_history()
-        game_memory = self.summarize_game_memory()
-        prompt = f"""
-{self.personality_description}
-You are playing Texas Hold'em poker.
-Your hand: {hole_card}
-Community cards: {round_state['community_card']}
-Valid actions: {[action['action'] for action in valid_actions]}
-Past experiences: {memory_summary}
-Recent chat:
-{chat_history}
-Past game decisions and outcomes: {game_memory}
-
-Based on your personality, past experiences, chat history, and the game state, what action will you take?
-Respond with one of the valid actions and an amount if necessary.
-"""
-        return prompt.strip()
-
-    def parse_action_response(self, response_text, valid_actions):
-        response_text = response_text.lower()
-        for action in valid_actions:
-            action_name = action['action']
-            if action_name in response_text:
-                amount = action.get('amount', 0)
-                if action_name == 'raise':
-                    amount = self.extract_raise_amount(response_text, action)
-                return action_name, amount
-        return valid_actions[0]['action'], valid_actions[0].get('amount', 0)
-
-    def extract_raise_amount(self, response_text, action):
-        import re
-        amounts = re.findall(r'\b\d+\b', response_text)
-        amount_info = action['amount']
-        if amounts:
-            amount = int(amounts[0])
-            if isinstance(amount_info, dict):
-                min_amount = amount_info['min']
-                max_amount = amount_info['max']
-                if min_amount <= amount <= max_amount:
-                    return amount
-                else:
-                    return min_amount
-            else:
-                return amount_info
-        else:
-            if isinstance(amount_info, dict):
-                return amount_info['min']
-            else:
-                return amount_info
+    def create_completion(self, messages):
+        model = self.active_model()
+        start_time = time.time()
+        completion = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=50
+        )
+        if completion.usage:
+            self.record_usage(model, completion.usage.prompt_tokens, completion.usage.completion_tokens, time.time() - start_time)
+        return completion
 
     def receive_game_start_message(self, game_info):
         super().receive_game_start_message(game_info)
@@ -303,18 +484,24 @@ Respond with one of the valid actions and an amount if necessary.
                 'hand_info': hand_info,
                 'round_state': round_state
             }))
+            gui_queue.put(('opponent_stats', {
+                player_uuid: self.opponent_stats.render_player(player_uuid)
+                for player_uuid in self.opponent_stats.players
+            }))
 
 
 # claude opus
 class ClaudePokerAgent(ModelPokerAgent):
     def get_chat_response(self, prompt, round_state):
-        response = self.call_claude_api(prompt, round_state, model=self.model_name)
+        response = self.call_claude_api(prompt, round_state, model=self.active_model())
         return response.content[0].text if response.content else ""
 
     def get_action_from_model(self, valid_actions, hole_card, round_state):
         prompt = self.create_action_prompt(valid_actions, hole_card, round_state)
-        response = self.call_claude_api(prompt, round_state, model=self.model_name)
+        response = self.call_claude_api(prompt, round_state, model=self.active_model())
         response_text = response.content[0].text if response.content else ""
+        self.last_prompt = prompt
+        self.last_response = response_text
         action = self.parse_action_response(response_text, valid_actions)
         return action
 
@@ -323,80 +510,33 @@ class ClaudePokerAgent(ModelPokerAgent):
 
         client = anthropic.Anthropic(api_key=anthropic_api_key)
 
+        start_time = time.time()
         response = client.messages.create(
             model=model,
             max_tokens=50,
             system=f"{self.personality_description}. You just took an action in the game. Respond with a brief message (1-2 sentences max) that is consistent with your action.",
             messages=[
-                {"role": "user", "content": f"Game state: {round_state}\n\n{prompt}"}
+                {"role": "user", "content": prompt}
             ]
         )
+        if response.usage:
+            self.record_usage(model, response.usage.input_tokens, response.usage.output_tokens, time.time() - start_time)
 
         return response
 
-    def parse_action_response(self, response_text, valid_actions):
-        response_text = response_text.lower()
-        for action in valid_actions:
-            action_name = action['action']
-            if action_name in response_text:
-                amount = action.get('amount', 0)
-                if action_name == 'raise':
-                    amount = self.extract_raise_amount(response_text, action)
-                return action_name, amount
-        return valid_actions[0]['action'], valid_actions[0].get('amount', 0)
-
-    def extract_raise_amount(self, response_text, action):
-        import re
-        amounts = re.findall(r'\b\d+\b', response_text)
-        amount_info = action['amount']
-        if amounts:
-            amount = int(amounts[0])
-            if isinstance(amount_info, dict):
-                min_amount = amount_info['min']
-                max_amount = amount_info['max']
-                if min_amount <= amount <= max_amount:
-                    return amount
-                else:
-                    return min_amount
-            else:
-                return amount_info
-        else:
-            if isinstance(amount_info, dict):
-                return amount_info['min']
-            else:
-                return amount_info
-
-    def create_action_prompt(self, valid_actions, hole_card, round_state):
-        memory_summary = self.summarize_memory()
-        chat_history = self.get_recent_chat_history()
-        game_memory = self.summarize_game_memory()
-        prompt = f"""
-{self.personality_description}
-You are playing Texas Hold'em poker.
-Your hand: {hole_card}
-Community cards: {round_state['community_card']}
-Valid actions: {[action['action'] for action in valid_actions]}
-Past experiences: {memory_summary}
-Recent chat:
-{chat_history}
-Past game decisions and outcomes: {game_memory}
-
-Based on your personality, past experiences, chat history, and the game state, what action will you take?
-Respond with one of the valid actions and an amount if necessary.
-"""
-        return prompt.strip()
-
 
 # claude sonnet 3.5
 class ClaudeSonnet35PokerAgent(ModelPokerAgent):
     def get_chat_response(self, prompt, round_state):
-        response = self.call_claude_api(prompt, round_state, model=self.model_name)
+        response = self.call_claude_api(prompt, round_state, model=self.active_model())
         return response.content[0].text if response.content else ""
 
     def get_action_from_model(self, valid_actions, hole_card, round_state):
         prompt = self.create_action_prompt(valid_actions, hole_card, round_state)
-        response = self.call_claude_api(prompt, round_state, model=self.model_name)
+        response = self.call_claude_api(prompt, round_state, model=self.active_model())
         response_text = response.content[0].text if response.content else ""
+        self.last_prompt = prompt
+        self.last_response = response_text
         action = self.parse_action_response(response_text, valid_actions)
         return action
 
@@ -405,65 +545,45 @@ class ClaudeSonnet35PokerAgent(ModelPokerAgent):
 
         client = anthropic.Anthropic(api_key=anthropic_api_key)
 
+        start_time = time.time()
         response = client.messages.create(
             model=model,
             max_tokens=50,
             system=f"{self.personality_description}. You just took an action in the game. Respond with a brief message (1-2 sentences max) that is consistent with your action.",
             messages=[
-                {"role": "user", "content": f"Game state: {round_state}\n\n{prompt}"}
+                {"role": "user", "content": prompt}
             ]
         )
+        if response.usage:
+            self.record_usage(model, response.usage.input_tokens, response.usage.output_tokens, time.time() - start_time)
 
         return response
 
-    def parse_action_response(self, response_text, valid_actions):
-        response_text = response_text.lower()
-        for action in valid_actions:
-            action_name = action['action']
-            if action_name in response_text:
-                amount = action.get('amount', 0)
-                if action_name == 'raise':
-                    amount = self.extract_raise_amount(response_text, action)
-                return action_name, amount
-        return valid_actions[0]['action'], valid_actions[0].get('amount', 0)
 
-    def extract_raise_amount(self, response_text, action):
-        import re
-        amounts = re.findall(r'\b\d+\b', response_text)
-        amount_info = action['amount']
-        if amounts:
-            amount = int(amounts[0])
-            if isinstance(amount_info, dict):
-                min_amount = amount_info['min']
-                max_amount = amount_info['max']
-                if min_amount <= amount <= max_amount:
-                    return amount
-                else:
-                    return min_amount
-            else:
-                return amount_info
-        else:
-            if isinstance(amount_info, dict):
-                return amount_info['min']
-            else:
-                return amount_info
+# offline self-play, decisions batched across tables (see lockstep.py)
+class BatchedPokerAgent(ModelPokerAgent):
+    def __init__(self, model_name, personality_description, display_name, batcher):
+        super().__init__(model_name, personality_description, display_name)
+        self.batcher = batcher
+        self.action_delay = 0  # The delay is only there for people watching the GUI
 
-    def create_action_prompt(self, valid_actions, hole_card, round_state):
-        memory_summary = self.summarize_memory()
-        chat_history = self.get_recent_chat_history()
-        game_memory = self.summarize_game_memory()
-        prompt = f"""
-{self.personality_description}
-You are playing Texas Hold'em poker.
-Your hand: {hole_card}
-Community cards: {round_state['community_card']}
-Valid actions: {[action['action'] for action in valid_actions]}
-Past experiences: {memory_summary}
-Recent chat:
-{chat_history}
-Past game decisions and outcomes: {game_memory}
+    def get_action_from_model(self, valid_actions, hole_card, round_state):
+        prompt = self.create_action_prompt(valid_actions, hole_card, round_state)
+        response_text = self.batcher.request(self.active_model(), self.personality_description, prompt, valid_actions, hole_card)
+        self.last_prompt = prompt
+        self.last_response = response_text
+        return self.parse_action_response(response_text, valid_actions)
+
+    def served_model(self):
+        # The backend may answer with another model than the seat's, e.g. the local policy
+        self.update_budget_level()
+        if self.budget.level >= LOCAL_POLICY:
+            return LOCAL_POLICY_MODEL
+        return self.batcher.backend.served_model(self.active_model())
 
-Based on your personality, past experiences, chat history, and the game state, what action will you take?
-Respond with one of the valid actions and an amount if necessary.
-"""
-        return prompt.strip()
\ No newline at end of file
+    def get_chat_response(self, prompt, round_state):
+        return ""
+
+    def consider_chatting_or_responding(self, round_state, action=None, amount=None, last_action=None):
+        # Chat calls would be unbatched requests in the middle of a lockstep
+        return None
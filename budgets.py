@@ -0,0 +1,144 @@
+import os
+
+# USD per million tokens (input, output). Unknown models are priced like gpt-4
+# so an unlisted model can't silently run over budget.
+MODEL_PRICING = {
+    'gpt-4': (30.0, 60.0),
+    'gpt-4o': (5.0, 15.0),
+    'gpt-4o-mini': (0.15, 0.6),
+    'claude-3-opus-20240229': (15.0, 75.0),
+    'claude-3-sonnet-20240229': (3.0, 15.0),
+    'claude-3-haiku-20240307': (0.25, 1.25),
+}
+DEFAULT_PRICING = MODEL_PRICING['gpt-4']
+
+# What each model falls back to once a seat is low on budget
+CHEAPER_MODELS = {
+    'gpt-4': 'gpt-4o-mini',
+    'gpt-4o': 'gpt-4o-mini',
+    'claude-3-opus-20240229': 'claude-3-haiku-20240307',
+    'claude-3-sonnet-20240229': 'claude-3-haiku-20240307',
+}
+
+# Degradation ladder, applied as the remaining budget fraction drops below each threshold
+FULL_SERVICE = 0
+NO_CHAT = 1
+SHRINK_PROMPTS = 2
+CHEAPER_MODEL = 3
+LOCAL_POLICY = 4
+DEGRADATION_THRESHOLDS = [
+    (LOCAL_POLICY, 0.02),
+    (CHEAPER_MODEL, 0.15),
+    (SHRINK_PROMPTS, 0.30),
+    (NO_CHAT, 0.50),
+]
+LEVEL_NAMES = ['full service', 'chat disabled', 'shrunk prompts', 'cheaper model', 'local policy']
+
+
+def estimate_cost(model_name, input_tokens, output_tokens):
+    input_price, output_price = MODEL_PRICING.get(model_name, DEFAULT_PRICING)
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+class Budget:
+    # Limits left as None are unlimited
+    def __init__(self, max_tokens=None, max_cost=None, max_latency=None):
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.max_latency = max_latency
+        self.tokens = 0
+        self.cost = 0.0
+        self.latency = 0.0
+        self.calls = 0
+
+    def record(self, tokens, cost, latency):
+        self.tokens += tokens
+        self.cost += cost
+        self.latency += latency
+        self.calls += 1
+
+    def remaining_fraction(self):
+        fractions = [1.0]
+        for used, limit in ((self.tokens, self.max_tokens), (self.cost, self.max_cost), (self.latency, self.max_latency)):
+            if limit:
+                fractions.append(max(0.0, 1.0 - used / limit))
+        return min(fractions)
+
+    def describe(self):
+        return f"{self.tokens} tokens, ${self.cost:.4f}, {self.latency:.1f}s over {self.calls} calls"
+
+
+def budget_from_env(prefix):
+    # e.g. SEAT_TOKEN_BUDGET, SEAT_COST_BUDGET_USD, SEAT_LATENCY_BUDGET_S (read from .env)
+    def read(name, cast):
+        value = os.getenv(f"{prefix}_{name}")
+        return cast(value) if value else None
+
+    return Budget(
+        max_tokens=read('TOKEN_BUDGET', int),
+        max_cost=read('COST_BUDGET_USD', float),
+        max_latency=read('LATENCY_BUDGET_S', float),
+    )
+
+
+class SeatBudget:
+    # One agent's budget plus the (optional) budget shared by the whole table.
+    # The seat degrades according to whichever of the two is closer to empty.
+    def __init__(self, seat_budget=None, table_budget=None):
+        self.seat_budget = seat_budget or Budget()
+        self.table_budget = table_budget
+        self.level = FULL_SERVICE
+
+    def record_usage(self, model_name, input_tokens, output_tokens, latency):
+        cost = estimate_cost(model_name, input_tokens, output_tokens)
+        tokens = input_tokens + output_tokens
+        self.seat_budget.record(tokens, cost, latency)
+        if self.table_budget:
+            self.table_budget.record(tokens, cost, latency)
+        return self.update_level()
+
+    def remaining_fraction(self):
+        fraction = self.seat_budget.remaining_fraction()
+        if self.table_budget:
+            fraction = min(fraction, self.table_budget.remaining_fraction())
+        return fraction
+
+    def update_level(self):
+        remaining = self.remaining_fraction()
+        level = FULL_SERVICE
+        for candidate, threshold in DEGRADATION_THRESHOLDS:
+            if remaining <= threshold:
+                level = candidate
+                break
+        # Never climb back up the ladder within a game
+        self.level = max(self.level, level)
+        return self.level
+
+    def describe(self):
+        # Whichever of the two budgets is driving the level
+        if self.table_budget and self.table_budget.remaining_fraction() < self.seat_budget.remaining_fraction():
+            return f"table budget: {self.table_budget.describe()}"
+        return f"seat budget: {self.seat_budget.describe()}"
+
+    def model_for(self, model_name):
+        if self.level >= CHEAPER_MODEL:
+            return CHEAPER_MODELS.get(model_name, model_name)
+        return model_name
+
+
+LOCAL_POLICY_MODEL = 'local-policy'  # Recorded as the model for decisions made by local_policy_action
+
+
+def local_policy_action(valid_actions, hole_card):
+    # Model-free fallback once a seat is out of budget: check when free, call with
+    # a pair or two high cards, otherwise fold. Never raises.
+    fold_action = valid_actions[0]
+    call_action = valid_actions[1]
+    if call_action['amount'] == 0:
+        return call_action['action'], call_action['amount']
+
+    ranks = [card[1] for card in hole_card]
+    high_cards = sum(1 for rank in ranks if rank in 'TJQKA')
+    if ranks[0] == ranks[1] or high_cards == 2:
+        return call_action['action'], call_action['amount']
+    return fold_action['action'], fold_action['amount']
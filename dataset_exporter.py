@@ -0,0 +1,78 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+DEFAULT_SHARD_SIZE = 50000  # Decisions per shard
+
+
+class DatasetExporter:
+    # Streams decisions to gzip-compressed JSONL shards for fine-tuning.
+    # Decisions are held only until their hand ends, when the outcome is filled
+    # in and they are written out, so memory stays bounded by one hand per seat.
+    # Each write is a complete gzip member, so a killed process still leaves a
+    # shard that reads back up to the last finished hand.
+    def __init__(self, output_dir, shard_size=DEFAULT_SHARD_SIZE, run_id=None):
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+        self.run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.pending = {}
+        # Reentrant so close() still works if shutdown interrupts a write
+        self.lock = threading.RLock()
+        self.shard_index = 0
+        self.shard_records = 0
+        self.shard_file = None
+        self.records_written = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def record_decision(self, player_uuid, record):
+        with self.lock:
+            self.pending.setdefault(str(player_uuid), []).append(record)
+
+    def record_outcome(self, player_uuid, outcome):
+        with self.lock:
+            records = self.pending.pop(str(player_uuid), [])
+            for record in records:
+                record['outcome'] = outcome
+            self.write(records)
+
+    def write(self, records):
+        if not records:
+            return
+        if self.shard_file is None or self.shard_records >= self.shard_size:
+            self.open_next_shard()
+        lines = ''.join(json.dumps(record, default=str, separators=(',', ':')) + '\n' for record in records)
+        self.shard_file.write(gzip.compress(lines.encode('utf-8')))
+        self.shard_file.flush()
+        self.shard_records += len(records)
+        self.records_written += len(records)
+
+    def open_next_shard(self):
+        if self.shard_file:
+            self.shard_file.close()
+            self.shard_index += 1
+        path = os.path.join(self.output_dir, f"decisions-{self.run_id}-{self.shard_index:05d}.jsonl.gz")
+        self.shard_file = open(path, 'wb')
+        self.shard_records = 0
+
+    def close(self):
+        with self.lock:
+            # Hands cut off by the end of the game have no outcome; keep them anyway
+            for player_uuid in list(self.pending):
+                records = self.pending.pop(player_uuid)
+                for record in records:
+                    record['outcome'] = None
+                self.write(records)
+            if self.shard_file:
+                self.shard_file.close()
+                self.shard_file = None
+        print(f"Exported {self.records_written} decisions to {self.output_dir}")
+
+
+def iter_records(paths):
+    # Reads shards back one record at a time; gzip reads every member in turn
+    for path in paths:
+        with gzip.open(path, 'rt', encoding='utf-8') as shard:
+            for line in shard:
+                yield json.loads(line)
@@ -0,0 +1,347 @@
+import argparse
+import glob
+import gzip
+import json
+import multiprocessing
+import os
+import time
+import zlib
+import numpy as np
+from dataset_exporter import iter_records
+
+# Scores decisions recorded by DatasetExporter. For every decision the hand is
+# played out by Monte Carlo against random opponent holdings to get equity,
+# then the chip EV of fold, call and raise is compared with what the agent
+# actually did. All the math runs on whole arrays of decisions at once.
+
+DEFAULT_TRIALS = 100  # Monte Carlo runouts per decision
+CHUNK_SIZE = 2048  # Decisions evaluated together; bounds memory per worker
+MAX_OPPONENTS = 5
+DEFAULT_SMALL_BLIND = 10  # Records from before small_blind_amount was exported
+
+STREETS = ['preflop', 'flop', 'turn', 'river']
+ACTIONS = ['fold', 'call', 'raise']
+RANKS = '23456789TJQKA'
+SUITS = 'CDHS'
+TEXT_COLUMNS = ('agent', 'model', 'personality')
+
+RANK_BITS = 1 << np.arange(13, dtype=np.int32)
+
+
+def build_tables():
+    masks = np.arange(1 << 13, dtype=np.int32)
+    popcount = np.zeros(1 << 13, dtype=np.int32)
+    for rank in range(13):
+        popcount += (masks >> rank) & 1
+
+    # Highest straight in a rank mask, as high card rank + 1 (0 if none)
+    straight = np.zeros(1 << 13, dtype=np.int32)
+    for high in range(12, 3, -1):
+        needed = 0b11111 << (high - 4)
+        straight = np.where((straight == 0) & ((masks & needed) == needed), high + 1, straight)
+    wheel = 0b1000000001111
+    straight = np.where((straight == 0) & ((masks & wheel) == wheel), 4, straight)
+
+    # top[k][mask] keeps only the k highest ranks of mask
+    top = np.zeros((6, 1 << 13), dtype=np.int32)
+    remaining = masks.copy()
+    for k in range(1, 6):
+        highest = np.where(remaining > 0, 1 << np.floor(np.log2(np.maximum(remaining, 1))).astype(np.int32), 0)
+        top[k] = top[k - 1] | highest
+        remaining = remaining & ~highest
+    return popcount, straight, top
+
+POPCOUNT, STRAIGHT, TOP = build_tables()
+
+
+def card_index(card):
+    # PyPokerEngine cards are suit then rank, e.g. 'CA'
+    return RANKS.index(card[1]) * 4 + SUITS.index(card[0])
+
+
+def evaluate_hands(cards):
+    # cards: int array (..., 7) of card indexes. Returns int32 scores where a
+    # higher score is a better hand: category << 26 | tiebreak rank masks.
+    ranks = cards // 4
+    suits = cards % 4
+    rank_bits = RANK_BITS[ranks]
+
+    # Per-hand rank counts with a single bincount over (hand, rank) slots
+    hand_count = ranks.size // 7
+    slots = (np.arange(hand_count, dtype=np.int64)[:, None] * 13 + ranks.reshape(hand_count, 7)).ravel()
+    counts = np.bincount(slots, minlength=hand_count * 13).reshape(ranks.shape[:-1] + (13,))
+    all_ranks = (counts > 0).astype(np.int32) @ RANK_BITS
+    singles = (counts == 1).astype(np.int32) @ RANK_BITS
+    pairs = (counts == 2).astype(np.int32) @ RANK_BITS
+    trips = (counts == 3).astype(np.int32) @ RANK_BITS
+    quads = (counts == 4).astype(np.int32) @ RANK_BITS
+
+    flush_ranks = np.zeros(all_ranks.shape, dtype=np.int32)
+    for suit in range(4):
+        suit_ranks = ((suits == suit) * rank_bits).sum(axis=-1)
+        flush_ranks |= np.where(POPCOUNT[suit_ranks] >= 5, suit_ranks, 0)
+
+    top_trips = TOP[1][trips]
+    top_pairs = TOP[2][pairs]
+    straight_flush = STRAIGHT[flush_ranks]
+    straight = STRAIGHT[all_ranks]
+
+    return np.select(
+        [
+            straight_flush > 0,
+            quads != 0,
+            (trips != 0) & ((pairs != 0) | (POPCOUNT[trips] >= 2)),
+            flush_ranks != 0,
+            straight > 0,
+            trips != 0,
+            POPCOUNT[pairs] >= 2,
+            pairs != 0,
+        ],
+        [
+            8 << 26 | straight_flush,
+            7 << 26 | quads << 13 | TOP[1][all_ranks & ~quads],
+            6 << 26 | top_trips << 13 | TOP[1][(trips & ~top_trips) | pairs],
+            5 << 26 | TOP[5][flush_ranks],
+            4 << 26 | straight,
+            3 << 26 | trips << 13 | TOP[2][singles],
+            2 << 26 | top_pairs << 13 | TOP[1][all_ranks & ~top_pairs],
+            1 << 26 | pairs << 13 | TOP[3][singles],
+        ],
+        default=TOP[5][singles]
+    ).astype(np.int32)
+
+
+def estimate_equity(hole, board, opponents, trials, rng):
+    # hole (n, 2) and board (n, 5) card indexes, -1 for board cards still to
+    # come; opponents (n,) players still in the hand besides the hero.
+    # Returns each decision's showdown equity, ties counted as split pots.
+    n = len(hole)
+    max_opponents = int(opponents.max())
+
+    dead = np.zeros((n, 52), dtype=bool)
+    known = np.concatenate([hole, board], axis=1)
+    rows = np.repeat(np.arange(n), known.shape[1])
+    dead[rows[known.ravel() >= 0], known.ravel()[known.ravel() >= 0]] = True
+
+    # A random order of the undealt cards for every trial: known cards get keys
+    # that sort them to the end
+    keys = rng.random((n, trials, 52), dtype=np.float32) + dead[:, None, :] * 2
+    deck = np.argsort(keys, axis=2)[:, :, :5 + 2 * max_opponents].astype(np.int32)
+
+    full_board = np.where(board[:, None, :] >= 0, board[:, None, :], deck[:, :, :5])
+    hero = evaluate_hands(np.concatenate([np.broadcast_to(hole[:, None, :], (n, trials, 2)), full_board], axis=2))
+
+    villains = np.empty((n, trials, max_opponents), dtype=np.int32)
+    for i in range(max_opponents):
+        villain_cards = deck[:, :, 5 + 2 * i:7 + 2 * i]
+        villains[:, :, i] = evaluate_hands(np.concatenate([villain_cards, full_board], axis=2))
+    folded = np.arange(max_opponents)[None, None, :] >= opponents[:, None, None]
+    villains = np.where(folded, -1, villains)
+
+    best_villain = villains.max(axis=2)
+    tied = (villains == hero[:, :, None]).sum(axis=2)
+    share = np.where(hero > best_villain, 1.0, np.where(hero == best_villain, 1.0 / (tied + 1), 0.0))
+    return share.mean(axis=1)
+
+
+def load_shard(path):
+    # Turns one shard into flat columns; run in worker processes, since JSON
+    # decoding dominates load time
+    columns = {name: [] for name in (
+        'agent', 'model', 'personality', 'street', 'hole', 'board', 'pot', 'to_call',
+        'call_amount', 'min_raise', 'amount', 'action', 'opponents', 'small_blind')}
+    try:
+        for record in iter_records([path]):
+            hole_card = record.get('hole_card') or []
+            if len(hole_card) != 2 or record.get('street') not in STREETS:
+                continue
+            valid_actions = record.get('valid_actions') or []
+            call_amount = valid_actions[1]['amount'] if len(valid_actions) > 1 else 0
+            min_raise = valid_actions[2]['amount']['min'] if len(valid_actions) > 2 else -1
+            board = [card_index(card) for card in record.get('community_card', [])[:5]]
+
+            columns['agent'].append(record.get('agent') or 'unknown')
+            columns['model'].append(record.get('model') or record.get('policy') or 'unknown')
+            columns['personality'].append(record.get('personality') or 'unknown')
+            columns['street'].append(STREETS.index(record['street']))
+            columns['hole'].append([card_index(card) for card in hole_card])
+            columns['board'].append(board + [-1] * (5 - len(board)))
+            columns['pot'].append(record.get('pot', 0))
+            columns['to_call'].append(record.get('to_call', call_amount))
+            columns['call_amount'].append(call_amount)
+            columns['min_raise'].append(min_raise)
+            columns['amount'].append(record.get('amount') or 0)
+            columns['action'].append(ACTIONS.index(record['action']) if record.get('action') in ACTIONS else 1)
+            # active_players includes this seat
+            columns['opponents'].append(min(max((record.get('active_players') or 2) - 1, 1), MAX_OPPONENTS))
+            columns['small_blind'].append(record.get('small_blind_amount') or DEFAULT_SMALL_BLIND)
+    except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError) as e:
+        # A shard cut off mid-write (e.g. by a killed engine) still has good records before the damage
+        print(f"Warning: {path} is damaged, keeping the {len(columns['street'])} decisions read before it: {e}")
+
+    shard = {}
+    for name, values in columns.items():
+        if name in TEXT_COLUMNS:
+            shard[name] = values
+        else:
+            shard[name] = np.array(values, dtype=np.int32)
+    shard['hole'] = shard['hole'].reshape(-1, 2)
+    shard['board'] = shard['board'].reshape(-1, 5)
+    return shard
+
+
+def load_decisions(paths, pool):
+    shards = pool.map(load_shard, paths) if pool else [load_shard(path) for path in paths]
+    decisions = {}
+    for name in shards[0] if shards else ():
+        if name in TEXT_COLUMNS:
+            decisions[name] = np.array([value for shard in shards for value in shard[name]], dtype=object)
+        else:
+            decisions[name] = np.concatenate([shard[name] for shard in shards])
+    return decisions
+
+
+def equity_chunk(args):
+    hole, board, opponents, trials, seed = args
+    return estimate_equity(hole, board, opponents, trials, np.random.default_rng(seed))
+
+
+def compute_equity(decisions, trials, pool, seed=0):
+    total = len(decisions['street'])
+    jobs = [
+        (decisions['hole'][start:start + CHUNK_SIZE], decisions['board'][start:start + CHUNK_SIZE],
+         decisions['opponents'][start:start + CHUNK_SIZE], trials, (seed, start))
+        for start in range(0, total, CHUNK_SIZE)
+    ]
+    results = pool.map(equity_chunk, jobs) if pool else [equity_chunk(job) for job in jobs]
+    return np.concatenate(results) if results else np.zeros(0)
+
+
+def action_evs(decisions, equity):
+    # Chip EV of each option measured from the current decision, with money
+    # already in the pot treated as sunk. It assumes the hand is checked down
+    # from here and that every opponent calls a raise: no fold equity and no
+    # later betting, so raises are scored conservatively.
+    pot = decisions['pot'].astype(np.float64)
+    to_call = decisions['to_call'].astype(np.float64)
+    callers = decisions['opponents'].astype(np.float64)
+
+    def raise_ev(total_bet):
+        increment = np.maximum(total_bet - decisions['call_amount'], 0).astype(np.float64)
+        cost = to_call + increment
+        return equity * (pot + cost + callers * increment) - cost
+
+    fold = np.zeros(len(pot))
+    call = equity * (pot + to_call) - to_call
+    can_raise = decisions['min_raise'] > 0
+    min_raise = np.where(can_raise, raise_ev(decisions['min_raise']), -np.inf)
+    chosen_raise = raise_ev(decisions['amount'])
+
+    chosen = np.choose(decisions['action'], [fold, call, chosen_raise])
+    best = np.maximum.reduce([fold, call, min_raise, chosen])
+    return chosen, best
+
+
+def analyze(decisions, equity):
+    chosen, best = action_evs(decisions, equity)
+    big_blind = decisions['small_blind'] * 2.0
+    decisions = dict(decisions)
+    decisions['equity'] = equity
+    decisions['chosen_ev_bb'] = chosen / big_blind
+    decisions['best_ev_bb'] = best / big_blind
+    decisions['ev_loss_bb'] = (best - chosen) / big_blind
+    return decisions
+
+
+def aggregate(decisions, by):
+    # Group means with np.unique/np.bincount, so a million rows take a fraction
+    # of a second per grouping
+    keys = [decisions[name] if name != 'street' else np.array(STREETS, dtype=object)[decisions['street']] for name in by]
+    codes = []
+    labels = []
+    for key in keys:
+        values, inverse = np.unique(key.astype(str), return_inverse=True)
+        labels.append(values)
+        codes.append(inverse)
+    groups, group_index = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+    group_index = group_index.ravel()
+    count = np.bincount(group_index, minlength=len(groups))
+
+    def mean(values):
+        return np.bincount(group_index, weights=values, minlength=len(groups)) / count
+
+    rows = []
+    stats = {
+        'fold_rate': mean(decisions['action'] == 0),
+        'call_rate': mean(decisions['action'] == 1),
+        'raise_rate': mean(decisions['action'] == 2),
+        'equity': mean(decisions['equity']),
+        'chosen_ev_bb': mean(decisions['chosen_ev_bb']),
+        'best_ev_bb': mean(decisions['best_ev_bb']),
+        'ev_loss_bb': mean(decisions['ev_loss_bb']),
+        'best_action_rate': mean(decisions['ev_loss_bb'] < 1e-9),
+    }
+    for i, group in enumerate(groups):
+        row = {name: str(labels[j][code]) for j, (name, code) in enumerate(zip(by, group))}
+        row['decisions'] = int(count[i])
+        row.update({name: float(values[i]) for name, values in stats.items()})
+        rows.append(row)
+    return rows
+
+
+def print_rows(rows, by):
+    header = ' '.join(f"{name:<24}" for name in by)
+    print(f"{header} {'decisions':>9} {'fold':>6} {'call':>6} {'raise':>6} {'equity':>7} {'EV bb':>7} {'loss bb':>8} {'best %':>7}")
+    for row in rows:
+        keys = ' '.join(f"{row[name][:24]:<24}" for name in by)
+        print(f"{keys} {row['decisions']:>9} {row['fold_rate']:>6.1%} {row['call_rate']:>6.1%} {row['raise_rate']:>6.1%} "
+              f"{row['equity']:>7.3f} {row['chosen_ev_bb']:>7.2f} {row['ev_loss_bb']:>8.2f} {row['best_action_rate']:>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score recorded decisions by EV against the alternatives.")
+    parser.add_argument('paths', nargs='+', help="Decision shards, or directories of them, written with --export-dir")
+    parser.add_argument('--trials', type=int, default=DEFAULT_TRIALS, help="Monte Carlo runouts per decision")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes used for loading and equity")
+    parser.add_argument('--group-by', action='append',
+                        help="Comma-separated columns to group by (default: agent,street; personality; model)")
+    parser.add_argument('--json', metavar='PATH', help="Also write every grouping's rows to PATH")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.paths:
+        paths.extend(sorted(glob.glob(os.path.join(path, '*.jsonl.gz'))) if os.path.isdir(path) else [path])
+    groupings = [grouping.split(',') for grouping in args.group_by] if args.group_by else [['agent', 'street'], ['personality'], ['model']]
+
+    pool = multiprocessing.Pool(args.workers) if args.workers and args.workers > 1 else None
+    try:
+        start_time = time.time()
+        decisions = load_decisions(paths, pool)
+        total = len(decisions.get('street', []))
+        print(f"Loaded {total} decisions from {len(paths)} shards in {time.time() - start_time:.1f}s")
+        if not total:
+            return
+
+        start_time = time.time()
+        equity = compute_equity(decisions, args.trials, pool, args.seed)
+        print(f"Equity for {total} decisions ({args.trials} runouts each) in {time.time() - start_time:.1f}s")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    decisions = analyze(decisions, equity)
+    report = {}
+    for by in groupings:
+        rows = aggregate(decisions, by)
+        report[','.join(by)] = rows
+        print()
+        print_rows(rows, by)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
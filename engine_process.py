@@ -0,0 +1,102 @@
+import multiprocessing
+import queue
+import signal
+import sys
+import threading
+
+# spawn rather than fork: the parent already has Qt running, which must not be
+# duplicated into the engine process
+mp_context = multiprocessing.get_context('spawn')
+STOP_TIMEOUT_S = 5  # How long a stopping engine gets to close its files before it is killed
+
+
+def exit_on_sigterm(signum, frame):
+    # Turns terminate() into SystemExit, so run_game's finally blocks close the
+    # exporter and results store instead of leaving them half written
+    sys.exit(0)
+
+
+def run_engine(connection, serve_host=None, serve_port=None, export_dir=None, results_db=None):
+    # Child process entry point. Events that would have gone to the in-process
+    # GUI are sent down the pipe instead.
+    from main import create_config, create_exporter, create_results, run_game
+    from poker_game import gui_queue
+    from spectator import SpectatorServer
+
+    signal.signal(signal.SIGTERM, exit_on_sigterm)
+    gui_queue.keep_local = False
+    gui_queue.listeners.append(connection.send)
+
+    server = None
+    if serve_port is not None:
+        server = SpectatorServer(serve_host, serve_port)
+        server.start()
+        gui_queue.listeners.append(server.publish)
+
+    try:
+        exporter = create_exporter(export_dir)
+        results = create_results(results_db)
+        run_game(create_config(exporter, results), exporter, results)
+    finally:
+        if server:
+            server.stop()
+        connection.send(None)
+        connection.close()
+
+
+class EngineProcess:
+    # Runs the poker engine in a child process and republishes its events on
+    # self.queue, which PokerGUI consumes exactly like the in-process gui_queue.
+    def __init__(self, serve_host=None, serve_port=None, export_dir=None, results_db=None):
+        self.serve_host = serve_host
+        self.serve_port = serve_port
+        self.export_dir = export_dir
+        self.results_db = results_db
+        self.queue = queue.Queue()
+        self.process = None
+        self.reader_thread = None
+
+    def start(self):
+        receive_end, send_end = mp_context.Pipe(duplex=False)
+        self.process = mp_context.Process(
+            target=run_engine,
+            args=(send_end, self.serve_host, self.serve_port, self.export_dir, self.results_db),
+            daemon=True
+        )
+        self.process.start()
+        send_end.close()  # Only the child writes; lets recv() see EOF if it dies
+
+        self.reader_thread = threading.Thread(target=self.read_events, args=(receive_end,), daemon=True)
+        self.reader_thread.start()
+        print(f"Engine process started (pid {self.process.pid})")
+
+    def read_events(self, connection):
+        with connection:
+            while True:
+                try:
+                    item = connection.recv()
+                except (EOFError, OSError):
+                    break
+                if item is None:
+                    break
+                self.queue.put(item)
+
+    def stop(self):
+        if self.process and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(STOP_TIMEOUT_S)
+            if self.process.is_alive():
+                self.process.kill()
+        if self.process:
+            self.process.join()
+        if self.reader_thread:
+            self.reader_thread.join()
+        self.process = None
+        self.reader_thread = None
+
+    def restart(self):
+        self.stop()
+        # Drop events from the old game so the GUI starts from a clean table
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.start()
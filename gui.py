@@ -1,16 +1,23 @@
 import sys
 import queue
-import os
-from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QLabel
-from PySide6.QtCore import QTimer, Signal, QObject, Qt, QPoint
-from PySide6.QtGui import QPixmap
+import threading
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout
+from PySide6.QtCore import QTimer, Signal, QObject
+from PySide6.QtGui import QKeySequence, QShortcut
+from gui_log import BoundedLogView, DEFAULT_LOG_LINE_CAP
+from table_scene import TableScene, TableView
 
 class PokerGUI(QWidget):
     update_signal = Signal(object)
+    restart_finished = Signal()
 
-    def __init__(self, gui_queue):
+    def __init__(self, gui_queue, log_line_cap=DEFAULT_LOG_LINE_CAP, restart_engine=None, use_opengl=False):
         super().__init__()
         self.gui_queue = gui_queue
+        self.log_line_cap = log_line_cap
+        self.restart_engine = restart_engine
+        self.use_opengl = use_opengl
+        self.restarting = False
         self.uuid_to_player_name = {}  
         self.player_hole_cards = {}    
         self.current_seats = [] 
@@ -21,112 +28,38 @@ class PokerGUI(QWidget):
             'Sonnet': '#4DA6FF',
         }
 
-        self.card_back = QPixmap('assets/card_back.png')
-        self.card_width = self.card_back.width()
-        self.card_height = self.card_back.height()
-
         self.init_ui()
 
         self.update_signal.connect(self.update_game_state)
+        self.restart_finished.connect(self.finish_restart_engine)
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.process_gui_queue)
         self.timer.start(100)
 
+        if self.restart_engine:
+            self.restart_shortcut = QShortcut(QKeySequence("Ctrl+R"), self)
+            self.restart_shortcut.activated.connect(self.handle_restart_engine)
+
     def init_ui(self):
         self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(0, 0, 0, 0)
 
-        self.table_label = QLabel(self)
-        table_image = QPixmap('assets/table.png')
-        self.table_label.setPixmap(table_image)
-        self.table_label.setScaledContents(True)
-        self.table_label.setGeometry(0, 0, table_image.width(), table_image.height())
-
-        self.table_width = table_image.width()
-        self.table_height = table_image.height()
-
-        self.setFixedSize(self.table_width, self.table_height)
+        self.table_scene = TableScene(list(self.player_colors), self.player_colors, self)
+        self.table_view = TableView(self.table_scene, self, use_opengl=self.use_opengl)
+        self.layout.addWidget(self.table_view)
 
-        self.init_players()
-        self.init_community_cards()
+        # Starts at the table image's size but can be resized freely; the view scales the table
+        self.resize(int(self.table_scene.table_width), int(self.table_scene.table_height))
+        self.setMinimumSize(400, 206)
 
         self.init_chat_and_actions()
 
         self.setLayout(self.layout)
 
-    def init_players(self):
-        self.player_card_labels = {}
-        self.player_name_labels = {}
-        self.player_chip_labels = {}
-
-        # Define positions for each player (unchanged)
-        self.player_positions = {
-            '4o': QPoint(self.table_width // 2 - self.card_width, self.table_height - (self.card_height + 50)),
-            'Opus': QPoint(self.table_width - (self.card_width * 2 + 50), self.table_height // 2 - self.card_height // 2),
-            'Sonnet': QPoint(self.table_width // 2 - self.card_width, 50),
-        }
-
-        for player_name, position in self.player_positions.items():
-            card_label1 = QLabel(self)
-            card_label2 = QLabel(self)
-
-            card_label1.setPixmap(self.card_back)
-            card_label2.setPixmap(self.card_back)
-            card_label1.setFixedSize(self.card_width, self.card_height)
-            card_label2.setFixedSize(self.card_width, self.card_height)
-
-            card_label1.move(position.x(), position.y())
-            card_label2.move(position.x() + self.card_width + 10, position.y())
-
-            self.player_card_labels[player_name] = (card_label1, card_label2)
-
-            # Calculate the center position for the name label
-            name_label_width = self.card_width * 2 + 10  # Width of two cards plus spacing
-            name_label_x = position.x() + (name_label_width - self.card_width * 2) // 2
-
-            # Create the player's name label
-            name_label = QLabel(player_name, self)
-            name_label.setStyleSheet("color: white; font-weight: bold;")
-            name_label.setAlignment(Qt.AlignCenter)
-            name_label.setFixedWidth(name_label_width)
-
-            chip_label = QLabel("Chips: 1000", self)
-            chip_label.setStyleSheet("color: white;")
-            chip_label.setAlignment(Qt.AlignCenter)
-            chip_label.setFixedWidth(name_label_width)
-
-            # Position labels based on player
-            if player_name == 'Sonnet':
-                name_label.move(name_label_x, position.y() - 55)
-                chip_label.move(name_label_x, position.y() - 35)
-            else:  # '4o' and 'Opus'
-                name_label.move(name_label_x, position.y() + self.card_height + 5)
-                chip_label.move(name_label_x, position.y() + self.card_height + 25)
-
-            self.player_name_labels[player_name] = name_label
-            self.player_chip_labels[player_name] = chip_label
-
-    def init_community_cards(self):
-        self.community_card_labels = []
-
-        total_community_width = 5 * self.card_width + 4 * 10
-        start_x = (self.table_width - total_community_width) // 2
-        start_y = (self.table_height - self.card_height) // 2
-
-        for i in range(5):
-            card_label = QLabel(self)
-
-            card_label.setPixmap(self.card_back)
-            card_label.setFixedSize(self.card_width, self.card_height)
-
-            card_label.move(start_x + i * (self.card_width + 10), start_y)
-
-            self.community_card_labels.append(card_label)
-
     def init_chat_and_actions(self):
         # Initialize game state display (actions)
-        self.game_state_display = QTextEdit(self)
-        self.game_state_display.setReadOnly(True)
+        self.game_state_display = BoundedLogView(self, line_cap=self.log_line_cap)
         self.game_state_display.setStyleSheet("""
             background-color: rgba(0, 0, 0, 150);
             color: white;
@@ -136,8 +69,8 @@ class PokerGUI(QWidget):
         self.game_state_display.raise_()
 
         # Initialize chat box
-        self.chat_box = QTextEdit(self)
-        self.chat_box.setReadOnly(True)
+        self.chat_box = BoundedLogView(self, line_cap=self.log_line_cap, word_wrap=True)
+        self.chat_box.setSpacing(4)  # Replaces the blank line that used to follow each message
         self.chat_box.setStyleSheet("""
             background-color: rgba(0, 0, 0, 150);
             color: white;
@@ -146,7 +79,14 @@ class PokerGUI(QWidget):
         self.chat_box.setGeometry(10, self.height() - 120, 300, 100)
         self.chat_box.raise_()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # The logs float over the table; keep the chat box pinned to the bottom
+        self.chat_box.move(10, self.height() - 120)
+
     def process_gui_queue(self):
+        if self.restarting:
+            return  # The new game's events wait until the table has been reset
         while not self.gui_queue.empty():
             queue_item = self.gui_queue.get()
             message_type = queue_item[0]
@@ -171,6 +111,8 @@ class PokerGUI(QWidget):
                 uuid = data.get('uuid')
                 display_name = data.get('display_name')
                 self.uuid_to_player_name[uuid] = display_name
+            elif message_type == 'opponent_stats':
+                self.update_opponent_stats(queue_item[1])
             else:
                 print(f"Unknown message type: {message_type}")
 
@@ -196,6 +138,7 @@ class PokerGUI(QWidget):
         game_info = message.get('game_info', {})
         self.game_state_display.append("Game started.")
         self.display_community_cards([])
+        self.table_scene.set_pot(0)
 
 
     def handle_round_start(self, message):
@@ -208,6 +151,7 @@ class PokerGUI(QWidget):
 
         # Clear community cards for the new round
         self.display_community_cards([])
+        self.table_scene.deal_hole_cards()
 
         # Update player info
         for seat in seats:
@@ -238,6 +182,14 @@ class PokerGUI(QWidget):
             if folded_seat:
                 # Update the player info with folded state
                 self.update_player_info(folded_seat, folded=True)
+        elif amount:
+            round_state = message.get('round_state', {})
+            pot = round_state.get('pot', {})
+            pot_amount = pot.get('main', {}).get('amount', 0) + sum(side.get('amount', 0) for side in pot.get('side', []))
+            self.table_scene.bet(player_name, pot_amount)
+            seat = next((seat for seat in round_state.get('seats', []) if str(seat.get('uuid', '')) == player_uuid), None)
+            if seat:
+                self.table_scene.set_stack(player_name, seat.get('stack', 0))
 
     def handle_round_result(self, message):
         winners = message.get('winners', [])
@@ -248,63 +200,66 @@ class PokerGUI(QWidget):
             winner_names.append(winner_name)
         self.game_state_display.append(f"Round ended. Winners: {', '.join(winner_names)}")
 
+        self.table_scene.pay_pot(winner_names)
+        for seat in message.get('round_state', {}).get('seats', []):
+            seat_name = self.uuid_to_player_name.get(str(seat.get('uuid', '')), 'Unknown')
+            self.table_scene.set_stack(seat_name, seat.get('stack', 0))
+
         # Clear hole cards for all players
-        for player_name, card_labels in self.player_card_labels.items():
-            card_back = QPixmap('assets/card_back.png')
-            for label in card_labels:
-                label.setPixmap(card_back)
+        for player_name in self.table_scene.player_cards:
+            self.table_scene.hide_hole_cards(player_name)
 
         # Clear community cards
         self.display_community_cards([])
 
+    def handle_restart_engine(self):
+        # Stopping the engine can take seconds (it gets time to close its files),
+        # so it runs off the Qt thread and the window keeps rendering meanwhile
+        if self.restarting:
+            return
+        self.restarting = True
+        self.game_state_display.append("Restarting engine...")
+        threading.Thread(target=self.restart_engine_worker, daemon=True).start()
+
+    def restart_engine_worker(self):
+        try:
+            self.restart_engine()
+        finally:
+            self.restart_finished.emit()
+
+    def finish_restart_engine(self):
+        self.reset_table()
+        self.restarting = False
+        self.game_state_display.append("Engine restarted.")
+
+    def reset_table(self):
+        self.uuid_to_player_name = {}
+        self.player_hole_cards = {}
+        self.current_seats = []
+        self.game_state_display.clear()
+        self.chat_box.clear()
+        self.table_scene.reset()
+
     def display_community_cards(self, community_cards):
-        for i, card_label in enumerate(self.community_card_labels):
-            if i < len(community_cards):
-                card_image_path = f"assets/deck/{community_cards[i]}.png"
-                if os.path.exists(card_image_path):
-                    card_image = QPixmap(card_image_path)
-                    card_label.setPixmap(card_image)
-                    card_label.setFixedSize(card_image.width(), card_image.height())
-                else:
-                    card_label.clear()
-            else:
-                # Show card back for unrevealed cards
-                card_label.setPixmap(self.card_back)
-                card_label.setFixedSize(self.card_width, self.card_height)
+        self.table_scene.set_community_cards(community_cards)
 
     def update_player_info(self, seat, hole_cards=None, folded=False):
         player_uuid = str(seat.get('uuid', ''))
         player_name = self.uuid_to_player_name.get(player_uuid, 'Unknown')
 
-        # Update card labels
-        card_labels = self.player_card_labels.get(player_name)
-        if card_labels:
-            if folded:
-                # Use the folded card back image
-                folded_card_back = QPixmap('assets/card_back_fold.png')
-                for label in card_labels:
-                    label.setPixmap(folded_card_back)
-                    label.setFixedSize(folded_card_back.width(), folded_card_back.height())
-            elif hole_cards:
-                for i, card in enumerate(hole_cards):
-                    card_image_path = f"assets/deck/{card}.png"
-                    if os.path.exists(card_image_path):
-                        card_image = QPixmap(card_image_path)
-                        card_labels[i].setPixmap(card_image)
-                        card_labels[i].setFixedSize(card_image.width(), card_image.height())
-                    else:
-                        card_labels[i].clear()
-            else:
-                # Use the regular card back image
-                for label in card_labels:
-                    label.setPixmap(self.card_back)
-                    label.setFixedSize(self.card_width, self.card_height)
+        if folded:
+            self.table_scene.fold(player_name)
+        elif hole_cards:
+            self.table_scene.show_hole_cards(player_name, hole_cards)
+        else:
+            self.table_scene.hide_hole_cards(player_name)
+
+        self.table_scene.set_stack(player_name, seat.get('stack', 0))
 
-        # Update chip amount
-        chip_label = self.player_chip_labels.get(player_name)
-        if chip_label:
-            stack = seat.get('stack', 0)
-            chip_label.setText(f"Chips: {stack}")
+    def update_opponent_stats(self, stats_by_uuid):
+        for player_uuid, stats_text in stats_by_uuid.items():
+            player_name = self.uuid_to_player_name.get(player_uuid, 'Unknown')
+            self.table_scene.set_player_tooltip(player_name, stats_text)
 
     def display_chat_message(self, sender_name, message):
         if message is None or message == "":
@@ -322,11 +277,4 @@ class PokerGUI(QWidget):
 
         color = self.player_colors.get(sender_name, 'black')
 
-        formatted_message = f'<span style="color: {color};">{sender_name}: {text}</span>'
-
-        self.chat_box.append(formatted_message)
-        self.chat_box.append("")
-
-        self.chat_box.verticalScrollBar().setValue(
-            self.chat_box.verticalScrollBar().maximum()
-        )
\ No newline at end of file
+        self.chat_box.append(f"{sender_name}: {text}", color)
\ No newline at end of file
@@ -0,0 +1,101 @@
+from PySide6.QtWidgets import QListView, QAbstractItemView
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QTimer, Qt
+from PySide6.QtGui import QColor
+
+DEFAULT_LOG_LINE_CAP = 500
+FRAME_INTERVAL_MS = 16
+
+
+class BoundedLogModel(QAbstractListModel):
+    # Fixed-size ring buffer of (text, color) lines. Once full, the oldest lines
+    # are dropped, so memory and per-append cost don't grow with session length.
+    def __init__(self, line_cap=DEFAULT_LOG_LINE_CAP, parent=None):
+        super().__init__(parent)
+        self.line_cap = max(1, line_cap)
+        self.lines = [None] * self.line_cap
+        self.start = 0
+        self.count = 0
+        self.colors = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.count:
+            return None
+        text, color = self.lines[(self.start + index.row()) % self.line_cap]
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.ForegroundRole and color:
+            if color not in self.colors:
+                self.colors[color] = QColor(color)
+            return self.colors[color]
+        return None
+
+    def append_lines(self, new_lines):
+        if not new_lines:
+            return
+        new_lines = new_lines[-self.line_cap:]
+
+        overflow = self.count + len(new_lines) - self.line_cap
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self.start = (self.start + overflow) % self.line_cap
+            self.count -= overflow
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), self.count, self.count + len(new_lines) - 1)
+        for line in new_lines:
+            self.lines[(self.start + self.count) % self.line_cap] = line
+            self.count += 1
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.lines = [None] * self.line_cap
+        self.start = 0
+        self.count = 0
+        self.endResetModel()
+
+
+class BoundedLogView(QListView):
+    # Drop-in replacement for the append-only QTextEdit logs. Appends are
+    # buffered and applied to the model at most once per frame.
+    def __init__(self, parent=None, line_cap=DEFAULT_LOG_LINE_CAP, word_wrap=False):
+        super().__init__(parent)
+        self.log_model = BoundedLogModel(line_cap, self)
+        self.setModel(self.log_model)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setWordWrap(word_wrap)
+        # Single-line rows can skip per-row size computation entirely
+        self.setUniformItemSizes(not word_wrap)
+
+        self.pending_lines = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FRAME_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def append(self, text, color=None):
+        self.pending_lines.append((text, color))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if not self.pending_lines:
+            return
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        lines, self.pending_lines = self.pending_lines, []
+        self.log_model.append_lines(lines)
+        # Only follow new lines if the user hasn't scrolled up to read history
+        if at_bottom:
+            self.scrollToBottom()
+
+    def clear(self):
+        self.pending_lines = []
+        self.log_model.clear()
@@ -0,0 +1,206 @@
+import argparse
+import threading
+import time
+from collections import defaultdict
+from poker_game import gui_queue
+from budgets import LOCAL_POLICY_MODEL, local_policy_action
+
+
+class LocalPolicyBackend:
+    # Stand-in for a local model server: answers every prompt in the batch with
+    # the rule-based policy. Useful to measure engine throughput on its own.
+    def served_model(self, model_name):
+        return LOCAL_POLICY_MODEL
+
+    def complete_batch(self, model_name, requests):
+        responses = []
+        for request in requests:
+            action, amount = local_policy_action(request['valid_actions'], request['hole_card'])
+            responses.append(f"{action} {amount}")
+        return responses
+
+
+class OpenAICompatibleBatchBackend:
+    # Sends the whole batch as one completions request with a list of prompts,
+    # which OpenAI-compatible local servers (e.g. vLLM) batch on the GPU.
+    def __init__(self, base_url, model_name=None, api_key="not-needed"):
+        from openai import OpenAI
+
+        self.client = OpenAI(base_url=base_url, api_key=api_key)
+        self.model_name = model_name
+
+    def served_model(self, model_name):
+        return self.model_name or model_name
+
+    def complete_batch(self, model_name, requests):
+        completion = self.client.completions.create(
+            model=self.served_model(model_name),
+            prompt=[f"{request['system']}\n\n{request['prompt']}\nAction:" for request in requests],
+            max_tokens=50
+        )
+        responses = [""] * len(requests)
+        for choice in completion.choices:
+            responses[choice.index] = choice.text
+        return responses
+
+
+class LockstepBatcher:
+    # Collects one pending decision from every running table, then dispatches
+    # them together. Tables block in request() until their batch is answered,
+    # so all tables advance one decision at a time, in step.
+    def __init__(self, backend, table_count):
+        self.backend = backend
+        self.active_tables = table_count
+        self.pending = []
+        self.condition = threading.Condition()
+        self.batches = 0
+        self.decisions = 0
+
+    def request(self, model_name, system, prompt, valid_actions=None, hole_card=None):
+        slot = {
+            'model': model_name,
+            'system': system,
+            'prompt': prompt,
+            'valid_actions': valid_actions,
+            'hole_card': hole_card,
+            'response': None,
+            'done': False,
+        }
+        with self.condition:
+            self.pending.append(slot)
+            self.dispatch_if_ready()
+            while not slot['done']:
+                self.condition.wait()
+        return slot['response']
+
+    def table_finished(self):
+        with self.condition:
+            self.active_tables -= 1
+            self.dispatch_if_ready()
+
+    def dispatch_if_ready(self):
+        # Every table still playing is waiting on us, so holding the lock while
+        # the backend works doesn't stall anything
+        if not self.pending or len(self.pending) < self.active_tables:
+            return
+        batch, self.pending = self.pending, []
+
+        by_model = defaultdict(list)
+        for slot in batch:
+            by_model[slot['model']].append(slot)
+        for model_name, slots in by_model.items():
+            try:
+                responses = self.backend.complete_batch(model_name, slots)
+            except Exception as e:
+                print(f"Batch of {len(slots)} decisions for {model_name} failed: {e}")
+                responses = [""] * len(slots)
+            for slot, response in zip(slots, responses):
+                slot['response'] = response
+
+        for slot in batch:
+            slot['done'] = True
+        self.batches += 1
+        self.decisions += len(batch)
+        self.condition.notify_all()
+
+
+class LockstepSimulator:
+    def __init__(self, table_count, backend, max_round=10, initial_stack=1000, small_blind_amount=10, exporter=None,
+                 results_store=None):
+        self.table_count = table_count
+        self.batcher = LockstepBatcher(backend, table_count)
+        self.max_round = max_round
+        self.initial_stack = initial_stack
+        self.small_blind_amount = small_blind_amount
+        self.exporter = exporter
+        self.results_store = results_store
+        self.results = [None] * table_count
+
+    def create_table(self):
+        from pypokerengine.api.game import setup_config
+        from agents import BatchedPokerAgent, share_opponent_stats
+        from main import gpt_personality, claude_opus_personality, claude_sonnet_personality
+        from results_db import TableRecorder
+
+        config = setup_config(max_round=self.max_round, initial_stack=self.initial_stack, small_blind_amount=self.small_blind_amount)
+        seats = [
+            ("gpt-4", gpt_personality, "4o"),
+            ("claude-3-opus-20240229", claude_opus_personality, "Opus"),
+            ("claude-3-sonnet-20240229", claude_sonnet_personality, "Sonnet"),
+        ]
+        recorder = TableRecorder(self.results_store) if self.results_store else None
+        agents = []
+        for model_name, personality, display_name in seats:
+            agent = BatchedPokerAgent(model_name, personality, display_name, self.batcher)
+            agent.exporter = self.exporter
+            agent.results = recorder
+            config.register_player(name=display_name, algorithm=agent)
+            agents.append(agent)
+        share_opponent_stats(agents)
+        return config, recorder
+
+    def run_table(self, table_index, config, recorder):
+        from pypokerengine.api.game import start_poker
+
+        try:
+            self.results[table_index] = start_poker(config, verbose=0)
+            if recorder:
+                recorder.finish_game(self.results[table_index])
+        finally:
+            self.batcher.table_finished()
+
+    def run(self):
+        # Nobody consumes gui_queue here; don't let it fill up
+        gui_queue.keep_local = False
+
+        tables = [self.create_table() for _ in range(self.table_count)]
+        threads = [
+            threading.Thread(target=self.run_table, args=(table_index, config, recorder), daemon=True)
+            for table_index, (config, recorder) in enumerate(tables)
+        ]
+        start_time = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.exporter:
+            self.exporter.close()
+        if self.results_store:
+            self.results_store.close()
+
+        elapsed = time.time() - start_time
+        print(f"{self.table_count} tables, {self.batcher.decisions} decisions in {self.batcher.batches} batches, {elapsed:.1f}s")
+        return self.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-play many tables with decisions batched across tables.")
+    parser.add_argument('--tables', type=int, default=64)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--server-url', help="OpenAI-compatible server to batch against; the local policy is used if omitted")
+    parser.add_argument('--model', help="Model name to request from --server-url (defaults to each seat's model)")
+    parser.add_argument('--export-dir', metavar='DIR', help="Stream decisions to JSONL shards in DIR")
+    parser.add_argument('--results-db', metavar='PATH', help="Record results and ratings in the SQLite database at PATH")
+    args = parser.parse_args()
+
+    if args.server_url:
+        backend = OpenAICompatibleBatchBackend(args.server_url, args.model)
+    else:
+        backend = LocalPolicyBackend()
+
+    exporter = None
+    if args.export_dir:
+        from dataset_exporter import DatasetExporter
+        exporter = DatasetExporter(args.export_dir)
+
+    results_store = None
+    if args.results_db:
+        from results_db import ResultsStore, print_leaderboard
+        results_store = ResultsStore(args.results_db)
+
+    LockstepSimulator(args.tables, backend, max_round=args.rounds, exporter=exporter, results_store=results_store).run()
+    if results_store:
+        print_leaderboard(ResultsStore(args.results_db))
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,9 @@
 import sys
+import argparse
 import threading
-from PySide6.QtWidgets import QApplication
-from pypokerengine.api.game import setup_config, start_poker
-from agents import GPT4PokerAgent, ClaudePokerAgent, ClaudeSonnet35PokerAgent
-from gui import PokerGUI
 from poker_game import gui_queue
+from spectator import SpectatorServer, SpectatorClient, DEFAULT_SPECTATOR_HOST
+from engine_process import EngineProcess
 
 gpt_personality = """
 Your name is 4o. You're a witty, unpredictable poker AI who:
@@ -46,7 +45,10 @@ Your name is Sonnet. You're a lucky, charismatic poker AI who:
 Goal: Have fun and enjoy the dynamic with 4o and Opus.
 """
 
-def setup_players(config):
+def setup_players(config, exporter=None, results=None):
+    from agents import GPT4PokerAgent, ClaudePokerAgent, ClaudeSonnet35PokerAgent, share_opponent_stats
+    from budgets import SeatBudget, budget_from_env
+
     gpt_agent = GPT4PokerAgent(
         model_name="gpt-4",
         personality_description=gpt_personality,
@@ -65,44 +67,142 @@ def setup_players(config):
         display_name="Sonnet"
     )
 
+    # Limits come from TABLE_*/SEAT_* variables in .env; unset limits are unlimited
+    table_budget = budget_from_env('TABLE')
+    for agent in (gpt_agent, claude_opus_agent, claude_sonnet_agent):
+        agent.budget = SeatBudget(budget_from_env('SEAT'), table_budget)
+        agent.exporter = exporter
+        agent.results = results
+    share_opponent_stats([gpt_agent, claude_opus_agent, claude_sonnet_agent])
+
     config.register_player(name="4o", algorithm=gpt_agent)
     config.register_player(name="Opus", algorithm=claude_opus_agent)
     config.register_player(name="Sonnet", algorithm=claude_sonnet_agent)
 
 
-def main():
-    app = QApplication(sys.argv)
-
-    config = setup_config(max_round=10, initial_stack=1000, small_blind_amount=10)
-
-    setup_players(config)
+def run_game(config, exporter=None, results=None):
+    from pypokerengine.api.game import start_poker
 
-    gui = PokerGUI(gui_queue)
-    gui.show()
+    class WrappedConfig:
+        def __init__(self, config):
+            self.config = config
+            self.players = [player for player in config.players_info]
 
-    def run_game():
-        class WrappedConfig:
-            def __init__(self, config):
-                self.config = config
-                self.players = [player for player in config.players_info]
+        def __getattr__(self, attr):
+            return getattr(self.config, attr)
 
-            def __getattr__(self, attr):
-                return getattr(self.config, attr)
-
-        wrapped_config = WrappedConfig(config)
+    wrapped_config = WrappedConfig(config)
 
+    try:
         game_result = start_poker(
             wrapped_config,
             verbose=1
         )
-        gui_queue.put(('game_state', {
-            'event': 'game_over',
-            'game_result': game_result
-        }))
+        if results:
+            results.finish_game(game_result)
+    finally:
+        # Also runs when the engine process is stopped, so buffered hands aren't lost
+        if exporter:
+            exporter.close()
+        if results:
+            results.store.close()
+    gui_queue.put(('game_state', {
+        'event': 'game_over',
+        'game_result': game_result
+    }))
+
+
+def create_config(exporter=None, results=None):
+    from pypokerengine.api.game import setup_config
+
+    config = setup_config(max_round=10, initial_stack=1000, small_blind_amount=10)
+    setup_players(config, exporter, results)
+    return config
+
+
+def create_exporter(export_dir):
+    from dataset_exporter import DatasetExporter
+
+    return DatasetExporter(export_dir) if export_dir else None
+
 
-    game_thread = threading.Thread(target=run_game)
+def create_results(results_db):
+    from results_db import ResultsStore, TableRecorder
+
+    return TableRecorder(ResultsStore(results_db)) if results_db else None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run a poker game between AI agents.")
+    parser.add_argument('--serve', type=int, metavar='PORT',
+                        help="Publish game events to spectators on this port (0 picks a free port)")
+    parser.add_argument('--host', default=DEFAULT_SPECTATOR_HOST,
+                        help="Interface the spectator server binds to, or the server to connect to with --spectate")
+    parser.add_argument('--headless', action='store_true',
+                        help="Run the engine without a local GUI (Qt is never imported)")
+    parser.add_argument('--engine-process', action='store_true',
+                        help="Run the engine in a child process so it can't stall the GUI (Ctrl+R restarts it)")
+    parser.add_argument('--export-dir', metavar='DIR',
+                        help="Stream every decision and its hand outcome to compressed JSONL shards in DIR")
+    parser.add_argument('--results-db', metavar='PATH',
+                        help="Record hands, results and ratings in the SQLite database at PATH")
+    parser.add_argument('--opengl', action='store_true',
+                        help="Render the table through an OpenGL viewport")
+    parser.add_argument('--spectate', type=int, metavar='PORT',
+                        help="Only open the GUI and watch a game served on --host:PORT")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.spectate is not None:
+        client = SpectatorClient(args.host, args.spectate)
+        client.start()
+        run_gui(client.queue, use_opengl=args.opengl)
+        return
+
+    if args.engine_process and not args.headless:
+        engine = EngineProcess(args.host, args.serve, args.export_dir, args.results_db)
+        engine.start()
+        run_gui(engine.queue, engine, use_opengl=args.opengl)
+        return
+
+    exporter = create_exporter(args.export_dir)
+    results = create_results(args.results_db)
+    config = create_config(exporter, results)
+
+    server = None
+    if args.serve is not None:
+        server = SpectatorServer(args.host, args.serve)
+        server.start()
+        gui_queue.listeners.append(server.publish)
+
+    if args.headless:
+        gui_queue.keep_local = False
+        run_game(config, exporter, results)
+        if server:
+            server.stop()
+        return
+
+    game_thread = threading.Thread(target=run_game, args=(config, exporter, results))
     game_thread.start()
 
+    run_gui(gui_queue, use_opengl=args.opengl)
+
+
+def run_gui(event_queue, engine=None, use_opengl=False):
+    from PySide6.QtWidgets import QApplication
+    from gui import PokerGUI
+
+    app = QApplication(sys.argv)
+
+    gui = PokerGUI(event_queue, restart_engine=engine.restart if engine else None, use_opengl=use_opengl)
+    gui.show()
+
+    if engine:
+        app.aboutToQuit.connect(engine.stop)
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+class PlayerStats:
+    def __init__(self):
+        self.hands = 0
+        self.vpip_hands = 0
+        self.pfr_hands = 0
+        self.aggressive_actions = 0
+        self.passive_actions = 0
+        self.faced_raise = 0
+        self.folded_to_raise = 0
+        self.showdowns = 0
+
+    def vpip(self):
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    def pfr(self):
+        return self.pfr_hands / self.hands if self.hands else 0.0
+
+    def aggression_factor(self):
+        if not self.passive_actions:
+            return float(self.aggressive_actions)
+        return self.aggressive_actions / self.passive_actions
+
+    def fold_to_raise(self):
+        return self.folded_to_raise / self.faced_raise if self.faced_raise else 0.0
+
+    def showdown_frequency(self):
+        return self.showdowns / self.hands if self.hands else 0.0
+
+    def to_dict(self):
+        return {
+            'hands': self.hands,
+            'vpip': self.vpip(),
+            'pfr': self.pfr(),
+            'aggression_factor': self.aggression_factor(),
+            'fold_to_raise': self.fold_to_raise(),
+            'showdown_frequency': self.showdown_frequency(),
+        }
+
+
+class OpponentStatsTracker:
+    # Running per-player counters for one table. Every hook does a constant
+    # amount of work, so keeping the stats current costs nothing as games get long.
+    def __init__(self):
+        self.players = {}
+        self.big_blind_uuid = None
+        self.big_blind_amount = 0
+        self.street = None
+        self.street_raiser = None
+        self.street_raise_seen = set()
+        self.hand_vpip = set()
+        self.hand_pfr = set()
+
+    def get(self, player_uuid):
+        player_uuid = str(player_uuid)
+        if player_uuid not in self.players:
+            self.players[player_uuid] = PlayerStats()
+        return self.players[player_uuid]
+
+    def on_round_start(self, seats, round_state=None):
+        self.hand_vpip = set()
+        self.hand_pfr = set()
+        self.street = 'preflop'
+        self.street_raiser = None
+        self.street_raise_seen = set()
+        for seat in seats:
+            # A blind can already be all-in from posting, but it's still dealt in
+            if seat.get('state') in ('participating', 'allin'):
+                self.get(seat.get('uuid')).hands += 1
+
+    def on_street_start(self, street, round_state):
+        self.street = street
+        self.street_raiser = None
+        self.street_raise_seen = set()
+        if street == 'preflop':
+            self.big_blind_amount = round_state.get('small_blind_amount', 0) * 2
+            seats = round_state.get('seats', [])
+            big_blind_pos = round_state.get('big_blind_pos')
+            if big_blind_pos is not None and big_blind_pos < len(seats):
+                self.big_blind_uuid = str(seats[big_blind_pos].get('uuid'))
+
+    def on_action(self, action):
+        player_uuid = str(action.get('player_uuid', ''))
+        action_type = action.get('action', '')
+        amount = action.get('amount', 0)
+        stats = self.get(player_uuid)
+
+        if self.street_raiser and self.street_raiser != player_uuid and player_uuid not in self.street_raise_seen:
+            self.street_raise_seen.add(player_uuid)
+            stats.faced_raise += 1
+            if action_type == 'fold':
+                stats.folded_to_raise += 1
+
+        if action_type == 'raise':
+            stats.aggressive_actions += 1
+            self.street_raiser = player_uuid
+            self.street_raise_seen = {player_uuid}
+            if self.street == 'preflop':
+                self.mark_vpip(player_uuid, stats)
+                if player_uuid not in self.hand_pfr:
+                    self.hand_pfr.add(player_uuid)
+                    stats.pfr_hands += 1
+        elif action_type == 'call' and amount > 0:
+            # The big blind "calling" its own blind is a check, not a voluntary
+            # bet, and like any other check it isn't a passive action either
+            is_big_blind_check = (self.street == 'preflop' and player_uuid == self.big_blind_uuid
+                                  and amount == self.big_blind_amount)
+            if not is_big_blind_check:
+                stats.passive_actions += 1
+                if self.street == 'preflop':
+                    self.mark_vpip(player_uuid, stats)
+
+    def mark_vpip(self, player_uuid, stats):
+        if player_uuid not in self.hand_vpip:
+            self.hand_vpip.add(player_uuid)
+            stats.vpip_hands += 1
+
+    def on_round_result(self, winners, hand_info):
+        # PyPokerEngine only fills hand_info when the hand reaches showdown
+        for info in hand_info or []:
+            self.get(info.get('uuid')).showdowns += 1
+
+    def snapshot(self, uuid_to_player_name=None):
+        names = uuid_to_player_name or {}
+        return {names.get(player_uuid, player_uuid): stats.to_dict() for player_uuid, stats in self.players.items()}
+
+    def render_player(self, player_uuid):
+        stats = self.get(player_uuid)
+        if not stats.hands:
+            return 'no hands yet'
+        return (
+            f"{stats.hands} hands, VPIP {stats.vpip():.0%}, PFR {stats.pfr():.0%}, "
+            f"AF {stats.aggression_factor():.1f}, fold to raise {stats.fold_to_raise():.0%}, "
+            f"showdown {stats.showdown_frequency():.0%}"
+        )
+
+    def render(self, uuid_to_player_name=None, exclude_uuid=None):
+        names = uuid_to_player_name or {}
+        lines = []
+        for player_uuid in self.players:
+            if player_uuid == str(exclude_uuid):
+                continue
+            lines.append(f"{names.get(player_uuid, player_uuid)}: {self.render_player(player_uuid)}")
+        return '\n'.join(lines)
@@ -1,6 +1,23 @@
 import queue
 
-gui_queue = queue.Queue()
+
+class EventQueue(queue.Queue):
+    # The GUI queue, plus a list of listeners (e.g. the spectator server) that see
+    # every event put on it. With keep_local off nothing is queued for an
+    # in-process GUI, so a headless engine doesn't accumulate events.
+    def __init__(self):
+        super().__init__()
+        self.listeners = []
+        self.keep_local = True
+
+    def put(self, item, block=True, timeout=None):
+        for listener in self.listeners:
+            listener(item)
+        if self.keep_local:
+            super().put(item, block, timeout)
+
+
+gui_queue = EventQueue()
 uuid_to_player_name = {}
 
 def broadcast_chat_message(sender_name, message):
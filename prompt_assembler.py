@@ -0,0 +1,206 @@
+from collections import Counter
+
+# Rough per-model prompt budgets (in tokens). These are well below the context
+# limits on purpose: the point is to keep each decision's prompt, and so its
+# latency, the same size on hand 500 as on hand 1.
+MODEL_PROMPT_BUDGETS = {
+    'gpt-4': 1200,
+    'gpt-4o': 1500,
+    'claude-3-opus-20240229': 1500,
+    'claude-3-sonnet-20240229': 1500,
+}
+DEFAULT_PROMPT_BUDGET = 1200
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = '...'
+
+
+def count_tokens(text):
+    # Cheap estimate (~4 characters per token) so we don't need a tokenizer per provider
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text, max_tokens, keep='end'):
+    if max_tokens <= 0:
+        return ''
+    if count_tokens(text) <= max_tokens:
+        return text
+    max_chars = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER) - 1
+    if max_chars <= 0:
+        return ''
+
+    # Drop whole lines: from the top with keep='end' (history, newest last),
+    # from the bottom with keep='start' (headers first)
+    lines = text.split('\n')
+    if keep == 'end':
+        lines.reverse()
+    kept = []
+    used = 0
+    for line in lines:
+        if used + len(line) + 1 > max_chars:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    if keep == 'end':
+        kept.reverse()
+
+    if not kept:
+        # Not even one line fits; cut the line nearest the kept end instead
+        if keep == 'end':
+            return TRUNCATION_MARKER + lines[0][-max_chars:]
+        return lines[0][:max_chars] + TRUNCATION_MARKER
+    if keep == 'end':
+        return TRUNCATION_MARKER + '\n' + '\n'.join(kept)
+    return '\n'.join(kept) + '\n' + TRUNCATION_MARKER
+
+
+class PromptAssembler:
+    def __init__(self, model_name, budget=None):
+        self.model_name = model_name
+        self.budget = budget or MODEL_PROMPT_BUDGETS.get(model_name, DEFAULT_PROMPT_BUDGET)
+        self.sections = []
+        self.last_token_counts = {}
+
+    def add_section(self, name, text, priority=0, required=False, keep='end'):
+        # Higher priority sections get budget first; required ones are never dropped
+        self.sections.append({
+            'name': name,
+            'text': (text or '').strip(),
+            'priority': priority,
+            'required': required,
+            'keep': keep,
+        })
+        return self
+
+    def build(self, budget=None):
+        remaining = budget or self.budget
+        fitted = {}
+
+        for index, section in enumerate(self.sections):
+            if section['required']:
+                fitted[index] = section['text']
+                remaining -= count_tokens(section['text'])
+
+        optional = [(index, section) for index, section in enumerate(self.sections) if not section['required']]
+        optional.sort(key=lambda item: -item[1]['priority'])
+        for index, section in optional:
+            text = truncate_to_tokens(section['text'], remaining, keep=section['keep'])
+            if text:
+                fitted[index] = text
+                remaining -= count_tokens(text)
+
+        self.last_token_counts = {
+            self.sections[index]['name']: count_tokens(text) for index, text in fitted.items()
+        }
+        self.sections = []
+        return '\n'.join(fitted[index] for index in sorted(fitted) if fitted[index])
+
+
+def render_round_state(round_state, uuid_to_player_name=None):
+    # Compact replacement for dumping the raw round_state dict. Only the current
+    # street's actions are listed; earlier streets are reduced to counts.
+    names = uuid_to_player_name or {}
+    if not round_state:
+        return 'Round state: unknown'
+
+    pot = round_state.get('pot', {})
+    pot_total = pot.get('main', {}).get('amount', 0) + sum(side.get('amount', 0) for side in pot.get('side', []))
+
+    seats = []
+    for seat in round_state.get('seats', []):
+        name = names.get(str(seat.get('uuid', '')), seat.get('name', 'Unknown'))
+        seats.append(f"{name} {seat.get('stack', 0)} ({seat.get('state', '')})")
+
+    street = round_state.get('street', '')
+    histories = round_state.get('action_histories', {})
+    earlier = []
+    for past_street, actions in histories.items():
+        if past_street == street or not actions:
+            continue
+        counts = Counter(action.get('action', '').lower() for action in actions)
+        earlier.append(f"{past_street}: " + ', '.join(f"{count} {name}" for name, count in counts.items()))
+
+    current = []
+    for action in histories.get(street, []):
+        name = names.get(str(action.get('uuid', '')), 'Unknown')
+        current.append(f"{name} {action.get('action', '').lower()} {action.get('amount', 0)}")
+
+    lines = [
+        f"Round {round_state.get('round_count', 0)}, street: {street}, pot: {pot_total}",
+        f"Community cards: {round_state.get('community_card', [])}",
+        f"Stacks: {'; '.join(seats)}",
+    ]
+    if earlier:
+        lines.append(f"Earlier streets: {'; '.join(earlier)}")
+    if current:
+        lines.append(f"This street: {'; '.join(current)}")
+    return '\n'.join(lines)
+
+
+def render_hands(hands):
+    return '\n'.join(
+        f"Round {hand['round_count']}: actions {hand['actions']}, {'win' if hand['win'] else 'loss'}, chips {hand['stack_change']:+d}"
+        for hand in hands
+    )
+
+
+class RollingSummary:
+    # Keeps at least the last `recent_hands` hands verbatim and folds everything
+    # older into a summary. The first refresh happens as soon as a hand leaves the
+    # recent window, then every `refresh_every` hands, so recent() plus the summary
+    # always cover the whole game. `summarizer` may be an LLM call taking
+    # (previous_summary, hands) and returning text; without one a rule-based
+    # summary is used.
+    def __init__(self, refresh_every=5, recent_hands=5, summarizer=None):
+        self.refresh_every = refresh_every
+        self.recent_hands = recent_hands
+        self.summarizer = summarizer
+        self.pending = []
+        self.hands_since_refresh = 0
+        self.summary = ''
+        self.hands_summarized = 0
+        self.hands_won = 0
+        self.action_counts = Counter()
+        self.chips_won = 0
+
+    def record_hand(self, hand):
+        self.pending.append(hand)
+        self.hands_since_refresh += 1
+        if len(self.pending) > self.recent_hands and (not self.hands_summarized or self.hands_since_refresh >= self.refresh_every):
+            self.refresh()
+
+    def refresh(self):
+        to_fold = self.pending[:-self.recent_hands] if self.recent_hands else self.pending
+        if not to_fold:
+            return
+        self.pending = self.pending[len(to_fold):]
+        self.hands_since_refresh = 0
+
+        for hand in to_fold:
+            self.hands_summarized += 1
+            self.hands_won += 1 if hand.get('win') else 0
+            self.action_counts.update(hand.get('actions', []))
+            self.chips_won += hand.get('stack_change', 0)
+
+        if self.summarizer:
+            try:
+                self.summary = self.summarizer(self.summary, to_fold).strip()
+                return
+            except Exception as e:
+                print(f"Summarizer failed, using rule-based summary: {e}")
+        self.summary = self.rule_based_summary()
+
+    def rule_based_summary(self):
+        if not self.hands_summarized:
+            return ''
+        actions = ', '.join(f"{name} x{count}" for name, count in self.action_counts.most_common())
+        return (
+            f"Over {self.hands_summarized} earlier hands you won {self.hands_won} "
+            f"(net chips {self.chips_won:+d}). Your actions: {actions or 'none'}."
+        )
+
+    def recent(self):
+        # Every hand not yet folded into the summary, oldest first
+        return list(self.pending)
@@ -0,0 +1,266 @@
+import itertools
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_BATCH_SIZE = 500  # Hands per insert transaction
+INITIAL_RATING = 1500.0
+ELO_K = 32.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    max_round INTEGER,
+    initial_stack INTEGER,
+    small_blind INTEGER
+);
+CREATE TABLE IF NOT EXISTS seats (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seat_uuid TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    model TEXT NOT NULL,
+    final_stack INTEGER,
+    PRIMARY KEY (game_id, seat_uuid)
+);
+CREATE TABLE IF NOT EXISTS hands (
+    id INTEGER PRIMARY KEY,
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    round_count INTEGER NOT NULL,
+    big_blind INTEGER NOT NULL,
+    showdown INTEGER NOT NULL,
+    UNIQUE (game_id, round_count)
+);
+CREATE TABLE IF NOT EXISTS hand_deltas (
+    hand_id INTEGER NOT NULL REFERENCES hands(id),
+    agent TEXT NOT NULL,
+    model TEXT NOT NULL,
+    delta INTEGER NOT NULL,
+    won INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    agent TEXT NOT NULL,
+    model TEXT NOT NULL,
+    rating REAL NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    hands INTEGER NOT NULL DEFAULT 0,
+    hands_won INTEGER NOT NULL DEFAULT 0,
+    chips_won INTEGER NOT NULL DEFAULT 0,
+    bb_won REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (agent, model)
+);
+CREATE INDEX IF NOT EXISTS idx_seats_agent_model ON seats (agent, model);
+CREATE INDEX IF NOT EXISTS idx_hands_game ON hands (game_id);
+CREATE INDEX IF NOT EXISTS idx_hand_deltas_agent_model ON hand_deltas (agent, model);
+CREATE INDEX IF NOT EXISTS idx_hand_deltas_hand ON hand_deltas (hand_id);
+"""
+
+
+def elo_updates(ratings, final_stacks, k=ELO_K):
+    # Multiplayer Elo: every pair of seats is scored as a head-to-head result
+    # decided by final stack, and each seat's change is averaged over its opponents
+    changes = {key: 0.0 for key in ratings}
+    if len(ratings) < 2:
+        return changes
+    for a, b in itertools.combinations(ratings, 2):
+        expected_a = 1.0 / (1.0 + 10 ** ((ratings[b] - ratings[a]) / 400.0))
+        if final_stacks[a] > final_stacks[b]:
+            score_a = 1.0
+        elif final_stacks[a] < final_stacks[b]:
+            score_a = 0.0
+        else:
+            score_a = 0.5
+        changes[a] += score_a - expected_a
+        changes[b] += expected_a - score_a
+    scale = k / (len(ratings) - 1)
+    return {key: change * scale for key, change in changes.items()}
+
+
+class ResultsStore:
+    # SQLite store for game, hand and per-seat results. Hands are buffered and
+    # written with executemany in one transaction per batch. Ratings and bb/100
+    # are kept as running totals, so leaderboard queries never rescan hands.
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        # Reentrant so close() still works if shutdown interrupts a write
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.pending_hands = []
+
+    def start_game(self, max_round, initial_stack, small_blind):
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO games (started_at, max_round, initial_stack, small_blind) VALUES (?, ?, ?, ?)",
+                (time.time(), max_round, initial_stack, small_blind)
+            )
+            return cursor.lastrowid
+
+    def record_hand(self, game_id, round_count, big_blind, showdown, deltas):
+        # deltas: list of (agent, model, chip delta, won)
+        with self.lock:
+            self.pending_hands.append((game_id, round_count, big_blind, showdown, deltas))
+            if len(self.pending_hands) >= self.batch_size:
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        if not self.pending_hands:
+            return
+        hands, self.pending_hands = self.pending_hands, []
+        totals = {}
+        with self.connection:
+            for game_id, round_count, big_blind, showdown, deltas in hands:
+                cursor = self.connection.execute(
+                    "INSERT OR REPLACE INTO hands (game_id, round_count, big_blind, showdown) VALUES (?, ?, ?, ?)",
+                    (game_id, round_count, big_blind, int(showdown))
+                )
+                hand_id = cursor.lastrowid
+                self.connection.executemany(
+                    "INSERT INTO hand_deltas (hand_id, agent, model, delta, won) VALUES (?, ?, ?, ?, ?)",
+                    [(hand_id, agent, model, delta, int(won)) for agent, model, delta, won in deltas]
+                )
+                for agent, model, delta, won in deltas:
+                    total = totals.setdefault((agent, model), [0, 0, 0, 0.0])
+                    total[0] += 1
+                    total[1] += int(won)
+                    total[2] += delta
+                    total[3] += delta / big_blind if big_blind else 0.0
+
+            self.ensure_ratings(totals)
+            self.connection.executemany(
+                "UPDATE ratings SET hands = hands + ?, hands_won = hands_won + ?, chips_won = chips_won + ?, bb_won = bb_won + ? "
+                "WHERE agent = ? AND model = ?",
+                [(hands, won, chips, bb, agent, model) for (agent, model), (hands, won, chips, bb) in totals.items()]
+            )
+
+    def ensure_ratings(self, keys):
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO ratings (agent, model, rating) VALUES (?, ?, ?)",
+            [(agent, model, INITIAL_RATING) for agent, model in keys]
+        )
+
+    def finish_game(self, game_id, final_seats):
+        # final_seats: list of (seat uuid, agent, model, final stack)
+        with self.lock:
+            self.flush_locked()
+            with self.connection:
+                self.connection.execute("UPDATE games SET finished_at = ? WHERE id = ?", (time.time(), game_id))
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO seats (game_id, seat_uuid, agent, model, final_stack) VALUES (?, ?, ?, ?, ?)",
+                    [(game_id, seat_uuid, agent, model, stack) for seat_uuid, agent, model, stack in final_seats]
+                )
+                keys = [(agent, model) for _, agent, model, _ in final_seats]
+                self.ensure_ratings(keys)
+                ratings = {}
+                for agent, model in keys:
+                    row = self.connection.execute(
+                        "SELECT rating FROM ratings WHERE agent = ? AND model = ?", (agent, model)
+                    ).fetchone()
+                    ratings[(agent, model)] = row[0]
+                stacks = {(agent, model): stack for _, agent, model, stack in final_seats}
+                changes = elo_updates(ratings, stacks)
+                self.connection.executemany(
+                    "UPDATE ratings SET rating = rating + ?, games = games + 1 WHERE agent = ? AND model = ?",
+                    [(change, agent, model) for (agent, model), change in changes.items()]
+                )
+
+    def leaderboard(self):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT agent, model, rating, games, hands, hands_won, chips_won, bb_won FROM ratings ORDER BY rating DESC"
+            ).fetchall()
+        return [{
+            'agent': agent,
+            'model': model,
+            'rating': rating,
+            'games': games,
+            'hands': hands,
+            'win_rate': hands_won / hands if hands else 0.0,
+            'chips_won': chips_won,
+            'bb_per_100': 100.0 * bb_won / hands if hands else 0.0,
+        } for agent, model, rating, games, hands, hands_won, chips_won, bb_won in rows]
+
+    def hand_stats(self, agent, model=None, since_game_id=0):
+        # Ad hoc query over the indexed per-hand deltas, e.g. for a window of games
+        query = (
+            "SELECT COUNT(*), SUM(d.won), SUM(d.delta), SUM(CAST(d.delta AS REAL) / h.big_blind) "
+            "FROM hand_deltas d JOIN hands h ON h.id = d.hand_id WHERE d.agent = ? AND h.game_id >= ?"
+        )
+        params = [agent, since_game_id]
+        if model:
+            query += " AND d.model = ?"
+            params.append(model)
+        with self.lock:
+            hands, won, chips, bb = self.connection.execute(query, params).fetchone()
+        hands = hands or 0
+        return {
+            'hands': hands,
+            'win_rate': (won or 0) / hands if hands else 0.0,
+            'chips_won': chips or 0,
+            'bb_per_100': 100.0 * (bb or 0.0) / hands if hands else 0.0,
+        }
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+
+class TableRecorder:
+    # Collects one table's results from its agents' hooks. Every agent reports
+    # its own side of each hand; once all seats have reported, the hand goes
+    # to the store.
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()
+        self.game_id = None
+        self.seat_count = 0
+        self.seat_info = {}
+        self.hand_reports = {}
+
+    def on_game_start(self, game_info):
+        with self.lock:
+            if self.game_id is not None:
+                return
+            rule = game_info.get('rule', {})
+            self.seat_count = game_info.get('player_num', len(game_info.get('seats', [])))
+            self.game_id = self.store.start_game(rule.get('max_round'), rule.get('initial_stack'), rule.get('small_blind_amount'))
+
+    def on_hand_result(self, seat_uuid, agent, model, round_state, delta, won, showdown):
+        with self.lock:
+            self.seat_info[str(seat_uuid)] = (agent, model)
+            round_count = round_state.get('round_count', 0)
+            reports = self.hand_reports.setdefault(round_count, [])
+            reports.append((agent, model, delta, won))
+            if len(reports) < self.seat_count:
+                return
+            del self.hand_reports[round_count]
+        big_blind = round_state.get('small_blind_amount', 0) * 2
+        self.store.record_hand(self.game_id, round_count, big_blind, showdown, reports)
+
+    def finish_game(self, game_result):
+        if self.game_id is None:
+            return
+        final_seats = []
+        for player in game_result.get('players', []):
+            agent, model = self.seat_info.get(str(player['uuid']), (player.get('name'), 'unknown'))
+            final_seats.append((str(player['uuid']), agent, model, player.get('stack', 0)))
+        self.store.finish_game(self.game_id, final_seats)
+
+
+def print_leaderboard(store):
+    print(f"{'agent':<10} {'model':<28} {'rating':>7} {'games':>6} {'hands':>7} {'win %':>6} {'bb/100':>8}")
+    for row in store.leaderboard():
+        print(f"{row['agent']:<10} {row['model']:<28} {row['rating']:>7.0f} {row['games']:>6} {row['hands']:>7} "
+              f"{row['win_rate']:>6.1%} {row['bb_per_100']:>8.1f}")
+
+if __name__ == "__main__":
+    print_leaderboard(ResultsStore(sys.argv[1] if len(sys.argv) > 1 else 'results.db'))
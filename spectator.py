@@ -0,0 +1,222 @@
+import copy
+import json
+import queue
+import socket
+import threading
+import time
+
+DEFAULT_SPECTATOR_HOST = '127.0.0.1'
+DEFAULT_SPECTATOR_PORT = 8765
+CLIENT_BACKLOG_LIMIT = 5000  # Messages buffered per viewer before it is dropped
+STOP_FLUSH_TIMEOUT_S = 5  # How long stop() lets viewers receive what is already queued
+
+
+def make_delta(old, new):
+    # Nested diff of JSON-like values. Dicts are diffed per key and lists that
+    # only grew (like action_histories) send just the appended items.
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {key: make_delta(old.get(key), value) for key, value in new.items() if old.get(key) != value or key not in old}
+        removed = [key for key in old if key not in new]
+        return {'d': changed, 'r': removed}
+    if isinstance(old, list) and isinstance(new, list) and len(new) >= len(old) and new[:len(old)] == old:
+        return {'a': new[len(old):]}
+    return {'v': new}
+
+
+def apply_delta(old, delta):
+    if 'v' in delta:
+        return delta['v']
+    if 'a' in delta:
+        return (old or []) + delta['a']
+    result = dict(old or {})
+    for key in delta.get('r', []):
+        result.pop(key, None)
+    for key, value_delta in delta.get('d', {}).items():
+        result[key] = apply_delta(result.get(key), value_delta)
+    return result
+
+
+def encode_message(message):
+    return (json.dumps(message, default=str, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def disconnect(connection, outbox):
+    # Never blocks: shutting the socket down breaks a writer stuck in sendall
+    # on a viewer that stopped reading, and the emptied outbox takes the stop marker
+    try:
+        connection.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    while True:
+        try:
+            outbox.get_nowait()
+        except queue.Empty:
+            break
+    try:
+        outbox.put_nowait(None)
+    except queue.Full:
+        pass
+
+
+class SpectatorServer:
+    # Publishes gui_queue events to any number of TCP viewers. publish() only
+    # hands the event to a dispatcher thread, so the engine never waits on
+    # encoding or on a slow viewer; a viewer that falls too far behind is dropped.
+    def __init__(self, host=DEFAULT_SPECTATOR_HOST, port=DEFAULT_SPECTATOR_PORT):
+        self.host = host
+        self.port = port
+        self.events = queue.Queue()
+        self.clients = []
+        self.lock = threading.Lock()
+        self.round_state = {}
+        self.uuid_mapping_messages = {}
+        self.round_messages = []
+        self.running = False
+
+    def start(self):
+        self.server_socket = socket.create_server((self.host, self.port))
+        self.port = self.server_socket.getsockname()[1]
+        self.running = True
+        self.client_threads = []
+        self.dispatch_thread = threading.Thread(target=self.dispatch_loop, daemon=True)
+        self.dispatch_thread.start()
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+        print(f"Spectator server listening on {self.host}:{self.port}")
+
+    def stop(self):
+        # Sends everything already published (e.g. game_over) before disconnecting viewers
+        self.running = False
+        self.events.put(None)
+        self.dispatch_thread.join()
+        self.server_socket.close()
+        with self.lock:
+            clients, self.clients = self.clients, []
+        for connection, outbox in clients:
+            try:
+                outbox.put_nowait(None)
+            except queue.Full:
+                # Too far behind to catch up; don't wait for it
+                disconnect(connection, outbox)
+        deadline = time.time() + STOP_FLUSH_TIMEOUT_S
+        for thread in self.client_threads:
+            thread.join(timeout=max(deadline - time.time(), 0))
+        for connection, outbox in clients:
+            disconnect(connection, outbox)
+
+    def publish(self, item):
+        self.events.put(item)
+
+    def accept_loop(self):
+        while self.running:
+            try:
+                connection, address = self.server_socket.accept()
+            except OSError:
+                break
+            print(f"Spectator connected from {address[0]}:{address[1]}")
+            outbox = queue.Queue(maxsize=CLIENT_BACKLOG_LIMIT)
+            with self.lock:
+                # Late joiners get the current table first so later deltas apply cleanly
+                for message in self.snapshot_messages():
+                    outbox.put_nowait(message)
+                self.clients.append((connection, outbox))
+            client_thread = threading.Thread(target=self.client_loop, args=(connection, outbox), daemon=True)
+            client_thread.start()
+            self.client_threads.append(client_thread)
+
+    def snapshot_messages(self):
+        messages = [encode_message(message) for message in self.uuid_mapping_messages.values()]
+        messages.extend(self.round_messages)
+        messages.append(encode_message({'type': 'round_state_base', 'round_state': self.round_state}))
+        if self.round_state:
+            # Redraw the current street (community cards) from the base just sent
+            messages.append(encode_message({'type': 'game_state', 'payload': [{
+                'event': 'street_start',
+                'street': self.round_state.get('street', ''),
+                'round_state_delta': {'d': {}, 'r': []},
+            }]}))
+        return messages
+
+    def client_loop(self, connection, outbox):
+        with connection:
+            while True:
+                data = outbox.get()
+                if data is None:
+                    break
+                try:
+                    connection.sendall(data)
+                except OSError:
+                    break
+        with self.lock:
+            if (connection, outbox) in self.clients:
+                self.clients.remove((connection, outbox))
+
+    def dispatch_loop(self):
+        while True:
+            item = self.events.get()
+            if item is None:
+                break
+            with self.lock:
+                message = self.to_message(item)
+                data = encode_message(message)
+                self.remember(message, data)
+                for connection, outbox in list(self.clients):
+                    try:
+                        outbox.put_nowait(data)
+                    except queue.Full:
+                        print("Dropping spectator that fell too far behind")
+                        self.clients.remove((connection, outbox))
+                        disconnect(connection, outbox)
+
+    def to_message(self, item):
+        message_type, payload = item[0], list(item[1:])
+        if message_type == 'game_state' and 'round_state' in payload[0]:
+            data = dict(payload[0])
+            round_state = copy.deepcopy(data.pop('round_state'))
+            data['round_state_delta'] = make_delta(self.round_state, round_state)
+            self.round_state = round_state
+            payload[0] = data
+        return {'type': message_type, 'payload': payload}
+
+    def remember(self, message, data):
+        message_type = message['type']
+        if message_type == 'update_uuid_mapping':
+            self.uuid_mapping_messages[message['payload'][0]['uuid']] = message
+        elif message_type == 'game_state' and message['payload'][0].get('event') == 'round_start':
+            self.round_messages = [data]
+        elif message_type in ('player_hole_cards', 'opponent_stats'):
+            self.round_messages.append(data)
+
+
+class SpectatorClient:
+    # Connects to a SpectatorServer and rebuilds the original gui_queue items on
+    # self.queue, so PokerGUI can consume them exactly as it does in-process.
+    def __init__(self, host=DEFAULT_SPECTATOR_HOST, port=DEFAULT_SPECTATOR_PORT):
+        self.host = host
+        self.port = port
+        self.queue = queue.Queue()
+        self.round_state = {}
+
+    def start(self):
+        self.connection = socket.create_connection((self.host, self.port))
+        threading.Thread(target=self.receive_loop, daemon=True).start()
+        print(f"Connected to spectator server at {self.host}:{self.port}")
+
+    def receive_loop(self):
+        with self.connection, self.connection.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                self.handle_message(json.loads(line))
+        print("Spectator server closed the connection")
+
+    def handle_message(self, message):
+        message_type = message.get('type')
+        if message_type == 'round_state_base':
+            self.round_state = message.get('round_state', {})
+            return
+
+        payload = message.get('payload', [])
+        if message_type == 'game_state' and 'round_state_delta' in payload[0]:
+            data = dict(payload[0])
+            self.round_state = apply_delta(self.round_state, data.pop('round_state_delta'))
+            data['round_state'] = self.round_state
+            payload[0] = data
+        self.queue.put((message_type, *payload))
@@ -0,0 +1,295 @@
+import os
+from PySide6.QtWidgets import (QGraphicsScene, QGraphicsView, QGraphicsPixmapItem, QGraphicsSimpleTextItem,
+                               QGraphicsEllipseItem, QGraphicsItem, QFrame)
+from PySide6.QtCore import Qt, QPointF, QVariantAnimation, QAbstractAnimation, QEasingCurve, QTimer
+from PySide6.QtGui import QPixmap, QPainter, QColor, QBrush, QPen, QFont, QTransform
+
+MOVE_DURATION_MS = 350
+FLIP_DURATION_MS = 220
+DEAL_STAGGER_MS = 70
+CARD_SPACING = 10
+
+
+class CardPixmaps:
+    # Every card image is loaded from disk once and shared by all card items
+    def __init__(self):
+        self.cache = {}
+
+    def get(self, card):
+        if card not in self.cache:
+            if card is None:
+                path = 'assets/card_back.png'
+            elif card == 'fold':
+                path = 'assets/card_back_fold.png'
+            else:
+                path = f"assets/deck/{card}.png"
+            self.cache[card] = QPixmap(path) if os.path.exists(path) else QPixmap()
+        return self.cache[card]
+
+
+class CardItem(QGraphicsPixmapItem):
+    def __init__(self, pixmaps, home_pos):
+        super().__init__(pixmaps.get(None))
+        self.pixmaps = pixmaps
+        self.card = None
+        self.target_card = None  # Where a running flip will end up
+        self.home_pos = home_pos
+        self.setPos(home_pos)
+        self.setTransformationMode(Qt.SmoothTransformation)
+        # Cached as a device-resolution texture; moving it is then just a blit
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
+    def set_card(self, card):
+        self.target_card = card
+        self.show_face(card)
+
+    def show_face(self, card):
+        if card != self.card:
+            self.card = card
+            self.setPixmap(self.pixmaps.get(card))
+
+
+class TableScene(QGraphicsScene):
+    # The whole table as a scene graph: the felt, cards, names, stacks and pot
+    # are persistent items that get moved, flipped or retexted, never rebuilt.
+    def __init__(self, player_names, player_colors=None, parent=None):
+        super().__init__(parent)
+        self.pixmaps = CardPixmaps()
+        self.player_colors = player_colors or {}
+
+        table_image = QPixmap('assets/table.png')
+        self.table_item = self.addPixmap(table_image)
+        self.table_item.setTransformationMode(Qt.SmoothTransformation)
+        self.table_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.setSceneRect(self.table_item.boundingRect())
+
+        self.table_width = table_image.width()
+        self.table_height = table_image.height()
+        card_back = self.pixmaps.get(None)
+        self.card_width = card_back.width()
+        self.card_height = card_back.height()
+        self.deck_pos = QPointF((self.table_width - self.card_width) / 2, (self.table_height - self.card_height) / 2)
+
+        self.init_seats(player_names)
+        self.init_community_cards()
+        self.init_pot()
+
+    def init_seats(self, player_names):
+        self.player_positions = {
+            '4o': QPointF(self.table_width // 2 - self.card_width, self.table_height - (self.card_height + 50)),
+            'Opus': QPointF(self.table_width - (self.card_width * 2 + 50), self.table_height // 2 - self.card_height // 2),
+            'Sonnet': QPointF(self.table_width // 2 - self.card_width, 50),
+        }
+        self.player_cards = {}
+        self.player_name_items = {}
+        self.player_chip_items = {}
+
+        for player_name in player_names:
+            position = self.player_positions.get(player_name)
+            if position is None:
+                continue
+            cards = (
+                CardItem(self.pixmaps, position),
+                CardItem(self.pixmaps, position + QPointF(self.card_width + CARD_SPACING, 0)),
+            )
+            for card in cards:
+                card.setZValue(2)
+                self.addItem(card)
+            self.player_cards[player_name] = cards
+
+            name_item = self.add_centered_text(player_name, bold=True)
+            chip_item = self.add_centered_text("Chips: 1000")
+            seat_width = self.card_width * 2 + CARD_SPACING
+            if player_name == 'Sonnet':
+                name_y, chip_y = position.y() - 55, position.y() - 35
+            else:
+                name_y, chip_y = position.y() + self.card_height + 5, position.y() + self.card_height + 25
+            self.place_centered(name_item, position.x() + seat_width / 2, name_y)
+            self.place_centered(chip_item, position.x() + seat_width / 2, chip_y)
+            self.player_name_items[player_name] = name_item
+            self.player_chip_items[player_name] = chip_item
+
+    def init_community_cards(self):
+        total_width = 5 * self.card_width + 4 * CARD_SPACING
+        start_x = (self.table_width - total_width) // 2
+        start_y = (self.table_height - self.card_height) // 2
+        self.community_cards = []
+        for i in range(5):
+            card = CardItem(self.pixmaps, QPointF(start_x + i * (self.card_width + CARD_SPACING), start_y))
+            card.setZValue(1)
+            self.addItem(card)
+            self.community_cards.append(card)
+        self.revealed_community = []
+
+    def init_pot(self):
+        self.pot_amount = 0
+        self.pot_target = 0  # Amount the pot will show once chips in flight land
+        self.pot_pos = QPointF(self.table_width / 2, self.deck_pos.y() + self.card_height + 4)
+        self.pot_item = self.add_centered_text("")
+        self.place_centered(self.pot_item, self.pot_pos.x(), self.pot_pos.y())
+
+    def add_centered_text(self, text, bold=False):
+        item = QGraphicsSimpleTextItem(text)
+        font = QFont()
+        font.setBold(bold)
+        item.setFont(font)
+        item.setBrush(QBrush(QColor('white')))
+        item.setZValue(3)
+        self.addItem(item)
+        return item
+
+    def place_centered(self, item, center_x, top_y):
+        item.setPos(center_x - item.boundingRect().width() / 2, top_y)
+
+    def set_centered_text(self, item, text):
+        center_x = item.pos().x() + item.boundingRect().width() / 2
+        item.setText(text)
+        self.place_centered(item, center_x, item.pos().y())
+
+    # Animations
+    def animate(self, duration, on_value, start=0.0, end=1.0, delay=0, easing=QEasingCurve.OutCubic, on_finished=None):
+        # Parented to the scene so it outlives this call; deleted once it stops
+        animation = QVariantAnimation(self)
+        animation.setDuration(duration)
+        animation.setStartValue(start)
+        animation.setEndValue(end)
+        animation.setEasingCurve(easing)
+        animation.valueChanged.connect(on_value)
+        if on_finished:
+            animation.finished.connect(on_finished)
+        if delay:
+            QTimer.singleShot(delay, lambda: animation.start(QAbstractAnimation.DeleteWhenStopped))
+        else:
+            animation.start(QAbstractAnimation.DeleteWhenStopped)
+        return animation
+
+    def move_item(self, item, start, end, delay=0, on_finished=None):
+        item.setPos(start)
+        self.animate(MOVE_DURATION_MS, item.setPos, start=start, end=end, delay=delay, on_finished=on_finished)
+
+    def flip_card(self, card_item, card, delay=0):
+        # Squash horizontally to nothing, swap the face, then expand again
+        center_x = card_item.boundingRect().width() / 2
+        card_item.target_card = card
+
+        def set_scale(scale):
+            card_item.setTransform(QTransform().translate(center_x, 0).scale(max(abs(scale), 0.01), 1).translate(-center_x, 0))
+            # A later set_card (e.g. the round ending) wins over a flip still in flight
+            if scale < 0 and card_item.target_card == card:
+                card_item.show_face(card)
+
+        self.animate(FLIP_DURATION_MS, set_scale, start=1.0, end=-1.0, delay=delay, easing=QEasingCurve.InOutSine,
+                     on_finished=lambda: card_item.setTransform(QTransform()))
+
+    def fly_chip(self, start, end, on_finished=None):
+        chip = QGraphicsEllipseItem(-7, -7, 14, 14)
+        chip.setBrush(QBrush(QColor('#E8C547')))
+        chip.setPen(QPen(QColor('#7A5C00'), 2))
+        chip.setZValue(4)
+        chip.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.addItem(chip)
+
+        def finished():
+            self.removeItem(chip)
+            if on_finished:
+                on_finished()
+
+        self.move_item(chip, start, end, on_finished=finished)
+
+    def seat_center(self, player_name):
+        position = self.player_positions.get(player_name, self.deck_pos)
+        return position + QPointF(self.card_width + CARD_SPACING / 2, self.card_height / 2)
+
+    # Table updates
+    def deal_hole_cards(self):
+        delay = 0
+        for cards in self.player_cards.values():
+            for card in cards:
+                card.set_card(None)
+                self.move_item(card, self.deck_pos, card.home_pos, delay=delay)
+                delay += DEAL_STAGGER_MS
+
+    def show_hole_cards(self, player_name, hole_cards):
+        cards = self.player_cards.get(player_name)
+        if not cards:
+            return
+        for i, card in enumerate(hole_cards[:2]):
+            if cards[i].target_card != card:
+                self.flip_card(cards[i], card, delay=i * DEAL_STAGGER_MS)
+
+    def hide_hole_cards(self, player_name):
+        for card in self.player_cards.get(player_name, ()):
+            card.set_card(None)
+
+    def fold(self, player_name):
+        for card in self.player_cards.get(player_name, ()):
+            card.set_card('fold')
+
+    def set_community_cards(self, community_cards):
+        if community_cards[:len(self.revealed_community)] != self.revealed_community:
+            self.revealed_community = []
+            for card in self.community_cards:
+                card.set_card(None)
+        delay = 0
+        for i in range(len(self.revealed_community), min(len(community_cards), 5)):
+            self.flip_card(self.community_cards[i], community_cards[i], delay=delay)
+            delay += DEAL_STAGGER_MS
+        self.revealed_community = list(community_cards[:5])
+
+    def set_stack(self, player_name, stack):
+        chip_item = self.player_chip_items.get(player_name)
+        if chip_item:
+            self.set_centered_text(chip_item, f"Chips: {stack}")
+
+    def set_pot(self, amount):
+        self.pot_amount = amount
+        self.set_centered_text(self.pot_item, f"Pot: {amount}" if amount else "")
+
+    def bet(self, player_name, pot_amount):
+        self.pot_target = pot_amount
+
+        def landed():
+            if self.pot_target == pot_amount:
+                self.set_pot(pot_amount)
+
+        self.fly_chip(self.seat_center(player_name), self.pot_pos, on_finished=landed)
+
+    def pay_pot(self, winner_names):
+        for winner_name in winner_names:
+            self.fly_chip(self.pot_pos, self.seat_center(winner_name))
+        self.pot_target = 0
+        self.set_pot(0)
+
+    def set_player_tooltip(self, player_name, text):
+        name_item = self.player_name_items.get(player_name)
+        if name_item:
+            name_item.setToolTip(text)
+
+    def reset(self):
+        for player_name in self.player_cards:
+            self.hide_hole_cards(player_name)
+            self.set_stack(player_name, 1000)
+        self.set_community_cards([])
+        self.pot_target = 0
+        self.set_pot(0)
+
+
+class TableView(QGraphicsView):
+    # Scales the table to whatever size the window is. Pass use_opengl to render
+    # through a QOpenGLWidget viewport.
+    def __init__(self, scene, parent=None, use_opengl=False):
+        super().__init__(scene, parent)
+        if use_opengl:
+            from PySide6.QtOpenGLWidgets import QOpenGLWidget
+            self.setViewport(QOpenGLWidget())
+        self.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setBackgroundBrush(QBrush(QColor('black')))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.fitInView(self.sceneRect(), Qt.KeepAspectRatio)